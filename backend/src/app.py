@@ -1,11 +1,22 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, Response, stream_with_context
 from dotenv import load_dotenv
 load_dotenv()
 from flask_cors import CORS
-from tts import TextToSpeech
-from video_generator import VideoGenerator
+from tts import TextToSpeech, get_audio_cache, PREVIEW_SECONDS
+from video_generator import VideoGenerator, get_slide_image
 from free_ai_video_generator import FreeAIVideoGenerator
+from job_queue import JobQueue
+from render_tasks import combine_video_with_audio, render_slide_video
+from render_pool import get_render_pool
+from batch_executor import BatchExecutor
+from media_server import MediaServer
+from result_cache import ResultCache
+from pipeline_dag import build_ai_video_pipeline
+from encoder_profiles import ENCODER_PROFILES, list_encoder_profiles
+from storage_manager import get_storage_manager
+from metrics import collect_timings, render_metrics, HTTP_REQUESTS, JOB_QUEUE_DEPTH, JOBS_RUNNING, RENDERS_IN_FLIGHT
 import os
+import json
 import time
 import hashlib
 from typing import Optional
@@ -16,128 +27,163 @@ CORS(app,
      methods=["GET", "POST", "OPTIONS"],
      allow_headers=["Content-Type", "Authorization"])
 
-def combine_video_with_audio(video_file, audio_file):
-    """Kombiniert AI-Video mit Audio"""
-    try:
-        print("🎵 Combining AI video with audio...")
-        
-        if not os.path.exists(video_file) or not os.path.exists(audio_file):
-            print("❌ Video or audio file not found")
-            return None
-        
-        import moviepy.editor as mp
-        
-        # Lade Video und Audio
-        video_clip = mp.VideoFileClip(video_file)
-        audio_clip = mp.AudioFileClip(audio_file)
-        
-        print(f"📹 Video duration: {video_clip.duration:.1f}s")
-        print(f"🔊 Audio duration: {audio_clip.duration:.1f}s")
-        
-        # Passe Video-Länge an Audio an
-        if video_clip.duration < audio_clip.duration:
-            # Video ist kürzer - wiederhole es
-            loops_needed = int(audio_clip.duration / video_clip.duration) + 1
-            print(f"🔄 Looping video {loops_needed} times to match audio length")
-            video_clip = mp.concatenate_videoclips([video_clip] * loops_needed)
-        
-        # Schneide Video auf Audio-Länge
-        video_clip = video_clip.subclip(0, audio_clip.duration)
-        
-        # Kombiniere Video und Audio
-        final_clip = video_clip.set_audio(audio_clip)
-        
-        # Speichere finales Video
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
-        final_filename = f"free_ai_final_{int(time.time())}.mp4"
-        final_path = os.path.join(output_dir, final_filename)
-        
-        print("💾 Saving final video...")
-        final_clip.write_videofile(
-            final_path,
-            fps=24,
-            codec='libx264',
-            bitrate='5000k',
-            audio_codec='aac',
-            verbose=False,
-            logger=None
-        )
-        
-        # Cleanup
-        video_clip.close()
-        audio_clip.close()
-        final_clip.close()
-        
-        print(f"✅ Final FREE AI video created: {final_path}")
-        return final_path
-        
-    except Exception as e:
-        print(f"❌ Video-Audio combination failed: {e}")
-        return video_file  # Gib wenigstens das Video zurück
+# Startzeit für die Uptime in /api/status
+START_TIME = time.time()
+
+# Obergrenze für /api/preview (sonst wird aus der Vorschau ein volles Rendering)
+MAX_PREVIEW_SECONDS = float(os.getenv('PREVIEW_MAX_SECONDS', '30'))
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+
+# Werkzeug-Reloader bei "python app.py" (Debug-Server)
+USE_RELOADER = True
+
+def is_serving_process() -> bool:
+    """
+    True nur im Prozess, der Requests bedient. Render-Worker (spawn/forkserver)
+    importieren dieses Modul als __mp_main__, der Elternprozess des Reloaders
+    überwacht nur Dateien (das Kind läuft mit WERKZEUG_RUN_MAIN=true).
+    """
+    if __name__ == '__mp_main__':
+        return False
+    if __name__ == '__main__' and USE_RELOADER:
+        return os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+    return True
+
+# Index, Quota und TTL-Eviction für den Output-Ordner
+storage_manager = get_storage_manager()
+# Sweeper nur im bedienenden Prozess: nur dort kommen register/pin/touch an
+if is_serving_process():
+    storage_manager.start()
+
+# Auslieferung generierter Dateien (Range, ETag, optional nginx/X-Sendfile)
+# Beim Download berechnete Hashes werden als ETag übernommen
+media_server = MediaServer(OUTPUT_DIR, hash_lookup=storage_manager.get_sha256)
+app.config['USE_X_SENDFILE'] = media_server.accel == 'sendfile'
+
+# Memoization identischer Generierungs-Requests (inkl. Single-Flight)
+result_cache = ResultCache(OUTPUT_DIR)
+
+# Begrenzter Worker-Pool für lange Generierungs-Jobs
+job_queue = JobQueue()
+
+# Parallele Batch-Verarbeitung (Threads für I/O, Prozesse für Encodes)
+batch_executor = BatchExecutor()
+
+# Gauges werden erst beim Scrape von /metrics gelesen
+JOB_QUEUE_DEPTH.set_function(lambda: job_queue.get_stats()['queued'])
+JOBS_RUNNING.set_function(lambda: job_queue.get_stats()['running'])
+RENDERS_IN_FLIGHT.set_function(lambda: get_render_pool().in_flight)
+
+@app.after_request
+def count_request(response):
+    """Zählt Requests pro Route und Statuscode für /metrics"""
+    HTTP_REQUESTS.inc(endpoint=request.url_rule.rule if request.url_rule else 'unknown',
+                      status=response.status_code)
+    return response
+
+def run_ai_video_pipeline(job, audio_text, video_description, options=None, service_used='free_ai_services'):
+    """
+    Komplette AI-Pipeline, läuft im Job-Worker:
+    TTS und AI-Video parallel, danach Kombination
+    """
+    options = options or {}
+    
+    # Verwende video_description falls vorhanden, sonst audio_text
+    video_prompt = video_description if video_description.strip() else audio_text
+    
+    job.update(stage='tts_and_ai_video', progress=10)
+    print("🔊🤖 Generating audio and FREE AI video concurrently...")
+    start_time = time.time()
+    
+    def combine(video_file, audio_file):
+        job.update(stage='combine', progress=80)
+        return get_render_pool().run(combine_video_with_audio, video_file, audio_file,
+                                     options.get('encoder_profile'))
+    
+    dag = build_ai_video_pipeline(audio_text, video_prompt, combine=combine,
+                                  preview=bool(options.get('preview')))
+    with collect_timings() as timings:
+        results = dag.run()
+    audio_file = results['tts']
+    final_video = results['combine']
+    
+    print(f"✅ FREE AI Video generated: {final_video}")
+    
+    # Erstelle URLs für Frontend
+    return {
+        'success': True,
+        'url': f"/output/{os.path.basename(final_video)}",
+        'audio_url': f"/output/{os.path.basename(audio_file)}",
+        'original_text': audio_text,
+        'video_description': video_description,
+        'options': options,
+        'processing_time': round(time.time() - start_time, 3),
+        'timings': timings,
+        'stage_timings': dag.timings,
+        'is_ai_generated': True,
+        'service_used': service_used,
+        'cost': 'FREE'
+    }
+
+def is_valid_encoder_profile(name) -> bool:
+    """Kein Profil (Standard) oder ein bekanntes Profil aus /api/options"""
+    return not name or name in ENCODER_PROFILES
+
+def submit_ai_video_job(kind):
+    """Liest den Request, reiht die AI-Pipeline ein und antwortet mit der Job-ID"""
+    data = request.json
+    audio_text = data.get('audioText', '') or data.get('text', '')
+    video_description = data.get('videoDescription', '')
+    options = data.get('options', {})
+    
+    if not audio_text:
+        return jsonify({'error': 'Audio text is required'}), 400
+    
+    if not is_valid_encoder_profile(options.get('encoder_profile')):
+        return jsonify({'error': f"Unknown encoder profile: {options.get('encoder_profile')}"}), 400
+    
+    print(f"\n🎬 === AI VIDEO GENERATION ({kind}) ===")
+    print(f"📝 Audio Text: {audio_text[:100]}...")
+    print(f"🎨 Video Description: {video_description[:100]}...")
+    print(f"⚙️ Options: {options}")
+    
+    # Identischer Request schon fertig? Dann vorhandenes Artefakt liefern
+    cache_key = ResultCache.make_key('ai_video', audioText=audio_text, videoDescription=video_description,
+                                     options=options)
+    cached = result_cache.get(cache_key)
+    if cached:
+        print("♻️ Result cache hit - returning existing video")
+        cached['cached'] = True
+        return jsonify(cached), 200
+    
+    def run_cached_pipeline(job):
+        result = None
+        try:
+            result = run_ai_video_pipeline(job, audio_text, video_description, options)
+            return result
+        finally:
+            result_cache.finish_job(cache_key, result)
+    
+    # Gleichzeitige identische Requests teilen sich einen Job
+    job, coalesced = result_cache.submit_job(cache_key, lambda: job_queue.submit(
+        kind, run_cached_pipeline, params={'audioText': audio_text, 'videoDescription': video_description}))
+    
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f"/api/jobs/{job.id}",
+        'coalesced': coalesced
+    }), 202
 
 @app.route('/api/generate-free-ai-video', methods=['POST'])
 def generate_free_ai_video():
     """
-    🆓 Generiert Videos mit 100% kostenlosen AI Services
+    🆓 Generiert Videos mit 100% kostenlosen AI Services (asynchron als Job)
     """
     try:
-        data = request.json
-        audio_text = data.get('audioText', '') or data.get('text', '')
-        video_description = data.get('videoDescription', '')
-        
-        if not audio_text:
-            return jsonify({'error': 'Audio text is required'}), 400
-        
-        print(f"\n🆓 === FREE AI VIDEO GENERATION ===")
-        print(f"📝 Audio Text: {audio_text[:100]}...")
-        print(f"🎨 Video Description: {video_description[:100]}...")
-        
-        # 1. Generiere Audio
-        print("🔊 Generating audio...")
-        tts = TextToSpeech()
-        audio_file = tts.generate_speech(audio_text)
-        
-        if not audio_file:
-            return jsonify({'error': 'Failed to generate audio'}), 500
-        
-        print(f"✅ Audio generated: {audio_file}")
-        
-        # 2. Generiere kostenloses AI Video
-        print("🤖 Starting FREE AI video generation...")
-        generator = FreeAIVideoGenerator()
-        
-        # Verwende video_description falls vorhanden, sonst audio_text
-        video_prompt = video_description if video_description.strip() else audio_text
-        
-        video_file = generator.generate_professional_video(video_prompt)
-        
-        if not video_file:
-            return jsonify({'error': 'All free AI video services failed'}), 500
-        
-        print(f"✅ FREE AI Video generated: {video_file}")
-        
-        # 3. Kombiniere Video mit Audio
-        final_video = combine_video_with_audio(video_file, audio_file)
-        
-        if not final_video:
-            # Falls Kombination fehlschlägt, verwende nur das Video
-            final_video = video_file
-        
-        # Erstelle URLs für Frontend
-        video_url = f"/output/{os.path.basename(final_video)}"
-        audio_url = f"/output/{os.path.basename(audio_file)}"
-        
-        return jsonify({
-            'success': True,
-            'url': video_url,
-            'audio_url': audio_url,
-            'original_text': audio_text,
-            'video_description': video_description,
-            'processing_time': time.time(),
-            'is_ai_generated': True,
-            'service_used': 'free_ai_services',
-            'cost': 'FREE'
-        }), 200
+        return submit_ai_video_job('free_ai_video')
         
     except Exception as e:
         print(f"❌ Error in FREE AI video generation: {str(e)}")
@@ -148,65 +194,10 @@ def generate_free_ai_video():
 @app.route('/api/generate-ai-video', methods=['POST'])
 def generate_ai_video():
     """
-    🎬 Hauptendpunkt für AI-Video-Generierung (nur FREE Services)
+    🎬 Hauptendpunkt für AI-Video-Generierung (nur FREE Services, asynchron als Job)
     """
     try:
-        data = request.json
-        audio_text = data.get('audioText', '') or data.get('text', '')
-        video_description = data.get('videoDescription', '')
-        options = data.get('options', {})
-        
-        if not audio_text:
-            return jsonify({'error': 'Audio text is required'}), 400
-        
-        print(f"\n🎬 === AI VIDEO GENERATION ===")
-        print(f"📝 Audio Text: {audio_text[:100]}...")
-        print(f"🎨 Video Description: {video_description[:100]}...")
-        print(f"⚙️ Options: {options}")
-        
-        # 1. Generiere Audio
-        print("🔊 Generating audio...")
-        tts = TextToSpeech()
-        audio_file = tts.generate_speech(audio_text)
-        
-        if not audio_file:
-            return jsonify({'error': 'Failed to generate audio'}), 500
-        
-        print(f"✅ Audio generated: {audio_file}")
-        
-        # 2. Verwende FREE AI Services
-        print("🆓 Using FREE AI Services...")
-        generator = FreeAIVideoGenerator()
-        video_prompt = video_description if video_description.strip() else audio_text
-        video_file = generator.generate_professional_video(video_prompt)
-        service_used = 'free_ai_services'
-        
-        if not video_file:
-            return jsonify({'error': 'All AI video services failed'}), 500
-        
-        print(f"✅ AI Video generated: {video_file}")
-        
-        # 3. Kombiniere mit Audio
-        final_video = combine_video_with_audio(video_file, audio_file)
-        if not final_video:
-            final_video = video_file
-        
-        # Erstelle URLs für Frontend
-        video_url = f"/output/{os.path.basename(final_video)}"
-        audio_url = f"/output/{os.path.basename(audio_file)}"
-        
-        return jsonify({
-            'success': True,
-            'url': video_url,
-            'audio_url': audio_url,
-            'original_text': audio_text,
-            'video_description': video_description,
-            'options': options,
-            'processing_time': time.time(),
-            'is_ai_generated': True,
-            'service_used': service_used,
-            'cost': 'FREE'
-        }), 200
+        return submit_ai_video_job('ai_video')
         
     except Exception as e:
         print(f"❌ Error in AI video generation: {str(e)}")
@@ -214,6 +205,50 @@ def generate_ai_video():
         traceback.print_exc()
         return jsonify({'error': f'AI video generation failed: {str(e)}'}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """
+    📋 Status, Stage, Fortschritt und Ergebnis eines Jobs
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job.to_dict()), 200
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """
+    📡 Server-Sent Events mit strukturierten Stage-Events eines Jobs
+    (tts, provider, download, encode, mux, finished/failed)
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    # Wiederaufnahme nach Verbindungsabbruch über Last-Event-ID
+    try:
+        start = int(request.headers.get('Last-Event-ID', -1)) + 1
+    except ValueError:
+        start = 0
+    
+    def generate():
+        index = start
+        while True:
+            events, done = job.wait_events(index, timeout=15)
+            for event in events:
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            index += len(events)
+            
+            if done and not events:
+                break
+            if not events:
+                # Keep-Alive, damit Proxies die Verbindung offen halten
+                yield ": keep-alive\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/test-free-services', methods=['GET'])
 def test_free_services():
     """
@@ -282,67 +317,158 @@ def generate_video():
     data = request.json
     text = data.get('text')
     audio_file = data.get('audio_file')
+    encoder_profile = data.get('encoder_profile')
     
     if not text:
         return jsonify({'error': 'Text must be provided'}), 400
     
-    if not audio_file:
-        tts = TextToSpeech()
-        audio_file = tts.generate_speech(text)
-        
-        if not audio_file:
-            return jsonify({'error': 'Failed to generate speech'}), 500
+    if not is_valid_encoder_profile(encoder_profile):
+        return jsonify({'error': f'Unknown encoder profile: {encoder_profile}'}), 400
     
-    video_generator = VideoGenerator()
-    video_file = video_generator.create_video(audio_file, text)
+    start_time = time.time()
+    with collect_timings() as timings:
+        if not audio_file:
+            tts = TextToSpeech()
+            audio_file = tts.generate_speech(text)
+            
+            if not audio_file:
+                return jsonify({'error': 'Failed to generate speech'}), 500
+        
+        video_file = get_render_pool().run(render_slide_video, audio_file, text, encoder_profile=encoder_profile,
+                                           slide_file=get_slide_image(text))
     
     if not video_file:
         return jsonify({'error': 'Failed to generate video'}), 500
     
-    return jsonify({'video_file': video_file}), 200
+    return jsonify({
+        'video_file': video_file,
+        'processing_time': round(time.time() - start_time, 3),
+        'timings': timings
+    }), 200
 
 @app.route('/api/generate-video', methods=['POST'])
 def generate_video_direct():
     """
-    Kombinierter Endpunkt für Standard-Video-Generierung
+    Kombinierter Endpunkt für Standard-Video-Generierung.
+    Mit incremental=true werden nur geänderte Segmente neu gerendert.
     """
     data = request.json
     text = data.get('text')
+    incremental = data.get('incremental', False)
+    encoder_profile = data.get('encoder_profile')
     
     if not text:
         return jsonify({'error': 'No text provided'}), 400
     
-    # Text zu Sprache
-    tts = TextToSpeech()
-    audio_file = tts.generate_speech(text)
+    if not is_valid_encoder_profile(encoder_profile):
+        return jsonify({'error': f'Unknown encoder profile: {encoder_profile}'}), 400
     
-    if not audio_file:
-        return jsonify({'error': 'Failed to generate speech'}), 500
+    def generate():
+        if incremental:
+            # Segmentweise: Audio und Video pro Satz aus dem Cache
+            video_file = VideoGenerator().create_incremental_video(text, encoder_profile=encoder_profile)
+        else:
+            # Text zu Sprache
+            tts = TextToSpeech()
+            audio_file = tts.generate_speech(text)
+            
+            if not audio_file:
+                raise RuntimeError('Failed to generate speech')
+            
+            # Sprache zu Video (im Render-Prozess)
+            video_file = get_render_pool().run(render_slide_video, audio_file, text,
+                                               encoder_profile=encoder_profile, slide_file=get_slide_image(text))
+        
+        if not video_file:
+            raise RuntimeError('Failed to generate video')
+        
+        return {'url': f"/output/{os.path.basename(video_file)}"}
     
-    # Sprache zu Video
-    video_generator = VideoGenerator()
-    video_file = video_generator.create_video(audio_file, text)
+    try:
+        cache_key = ResultCache.make_key('video', text=text, incremental=incremental,
+                                         encoder_profile=encoder_profile)
+        start_time = time.time()
+        with collect_timings() as timings:
+            result, cache_status = result_cache.run(cache_key, generate)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 500
     
-    if not video_file:
-        return jsonify({'error': 'Failed to generate video'}), 500
+    return jsonify(dict(result, cached=cache_status != 'miss', processing_time=round(time.time() - start_time, 3),
+                        timings=timings)), 200
+
+@app.route('/api/preview', methods=['POST'])
+def generate_preview():
+    """
+    Schnelle Vorschau: 360p/480p, nur die ersten Sekunden, Ultrafast-Encode.
+    TTS-Chunks landen im Cache und werden vom finalen Rendering wiederverwendet.
+    """
+    data = request.json
+    text = data.get('text')
+    resolution = data.get('resolution', '480p')
+    style = data.get('style', 'explainer')
+    
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    try:
+        seconds = float(data.get('seconds', PREVIEW_SECONDS))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'seconds must be a number'}), 400
+    
+    # 0 würde das Kürzen abschalten, negative Werte schneiden vom Ende (MoviePy-subclip)
+    if not 1 <= seconds <= MAX_PREVIEW_SECONDS:
+        return jsonify({'error': f'seconds must be between 1 and {MAX_PREVIEW_SECONDS:g}'}), 400
     
-    video_url = f"/output/{os.path.basename(video_file)}"
+    if resolution not in ('360p', '480p'):
+        return jsonify({'error': 'Preview resolution must be 360p or 480p'}), 400
     
-    return jsonify({'url': video_url}), 200
+    def generate():
+        audio_file = TextToSpeech().generate_preview_speech(text, seconds)
+        
+        if not audio_file:
+            raise RuntimeError('Failed to generate speech')
+        
+        video_file = get_render_pool().run(render_slide_video, audio_file, text, resolution, style, True,
+                                           max_duration=seconds,
+                                           slide_file=get_slide_image(text, resolution, style))
+        
+        if not video_file:
+            raise RuntimeError('Failed to generate preview')
+        
+        return {
+            'url': f"/output/{os.path.basename(video_file)}",
+            'preview': True,
+            'resolution': resolution,
+            'max_seconds': seconds
+        }
+    
+    try:
+        cache_key = ResultCache.make_key('preview', text=text, resolution=resolution, style=style, seconds=seconds)
+        start_time = time.time()
+        with collect_timings() as timings:
+            result, cache_status = result_cache.run(cache_key, generate)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify(dict(result, cached=cache_status != 'miss', processing_time=round(time.time() - start_time, 3),
+                        timings=timings)), 200
 
 @app.route('/output/<filename>')
 def serve_file(filename):
     """
     Dient dazu, generierte Dateien an das Frontend zu senden.
+    Unterstützt Range-Requests (206), ETag/If-None-Match (304) und X-Accel/X-Sendfile.
     """
     try:
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
-        file_path = os.path.join(output_dir, filename)
+        response = media_server.serve(filename)
         
-        if not os.path.exists(file_path):
+        if response is None:
             return jsonify({'error': 'File not found'}), 404
         
-        return send_file(file_path)
+        # Zugriff zählt für die LRU-Eviction
+        storage_manager.touch(filename)
+        
+        return response
         
     except Exception as e:
         print(f"Error serving file: {str(e)}")
@@ -375,34 +501,25 @@ def health_check():
 @app.route('/api/cleanup', methods=['POST'])
 def cleanup_files():
     """
-    Löscht alte generierte Dateien
+    Löscht generierte Dateien über den Storage-Index.
+    Standard: alle nicht gepinnten Artefakte, mit {"mode": "evict"} nur
+    abgelaufene bzw. über der Quota liegende (wie der Hintergrund-Sweep).
     """
     try:
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
-        
-        if not os.path.exists(output_dir):
-            return jsonify({'message': 'No files to cleanup'}), 200
-        
-        deleted_files = 0
-        total_size = 0
-        
-        for filename in os.listdir(output_dir):
-            if filename.endswith(('.mp3', '.mp4', '.wav', '.avi')):
-                file_path = os.path.join(output_dir, filename)
-                try:
-                    file_size = os.path.getsize(file_path)
-                    os.remove(file_path)
-                    deleted_files += 1
-                    total_size += file_size
-                except Exception as e:
-                    print(f"Error deleting {filename}: {str(e)}")
-                            # Konvertiere Bytes zu MB
-        total_size_mb = total_size / (1024 * 1024)
+        data = request.get_json(silent=True) or {}
+        
+        if data.get('mode') == 'evict':
+            result = storage_manager.evict()
+            storage_manager.save()
+        else:
+            result = storage_manager.cleanup()
+        
+        deleted_files = result['deleted_files']
         
         return jsonify({
             'message': f'Cleanup completed. {deleted_files} files deleted.',
             'deleted_files': deleted_files,
-            'freed_space_mb': round(total_size_mb, 2)
+            'freed_space_mb': round(result['freed_bytes'] / (1024 * 1024), 2)
         }), 200
         
     except Exception as e:
@@ -415,29 +532,22 @@ def get_system_status():
     Gibt detaillierte Systeminformationen zurück.
     """
     try:
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
-        
-        # Zähle Dateien im Output-Verzeichnis
-        file_count = 0
-        total_size = 0
-        if os.path.exists(output_dir):
-            for filename in os.listdir(output_dir):
-                if filename.endswith(('.mp3', '.mp4', '.wav', '.avi')):
-                    file_path = os.path.join(output_dir, filename)
-                    file_count += 1
-                    total_size += os.path.getsize(file_path)
+        # Dateizahl und Größe aus dem Storage-Index (kein Verzeichnis-Scan)
+        storage = storage_manager.get_stats()
         
         return jsonify({
             'system': {
                 'status': 'running',
-                'uptime': time.time(),
+                'uptime': round(time.time() - START_TIME, 1),
+                'started_at': START_TIME,
                 'version': '3.0.0'
             },
-            'storage': {
-                'output_files': file_count,
-                'total_size_mb': round(total_size / (1024 * 1024), 2),
-                'output_directory': output_dir
-            },
+            'storage': dict(storage, output_files=storage['files'], total_size_mb=storage['size_mb'],
+                            output_directory=OUTPUT_DIR),
+            'jobs': job_queue.get_stats(),
+            'tts_cache': get_audio_cache().get_stats(),
+            'render_pool': get_render_pool().get_stats(),
+            'result_cache': result_cache.get_stats(),
             'services': {
                 'tts': 'available',
                 'video_generator': 'available',
@@ -448,6 +558,13 @@ def get_system_status():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Prometheus-Metriken: Stage-Histogramme, Cache- und Fehlerzähler, Queue-Gauges
+    """
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/tts/validate', methods=['POST'])
 def validate_text():
     """
@@ -583,6 +700,8 @@ def get_resolutions():
     Gibt verfügbare Video-Auflösungen zurück
     """
     resolutions = [
+        {'code': '360p', 'name': '360p (Vorschau)', 'width': 640, 'height': 360},
+        {'code': '480p', 'name': '480p (Vorschau)', 'width': 854, 'height': 480},
         {'code': '720p', 'name': '720p (HD)', 'width': 1280, 'height': 720},
         {'code': '1080p', 'name': '1080p (Full HD)', 'width': 1920, 'height': 1080},
         {'code': '1440p', 'name': '1440p (2K)', 'width': 2560, 'height': 1440},
@@ -646,6 +765,8 @@ def get_available_options():
                 {'code': 'fast', 'name': 'Schnell'}
             ],
             'resolutions': [
+                {'code': '360p', 'name': '360p (Vorschau)'},
+                {'code': '480p', 'name': '480p (Vorschau)'},
                 {'code': '720p', 'name': '720p (HD)'},
                 {'code': '1080p', 'name': '1080p (Full HD)'},
                 {'code': '1440p', 'name': '1440p (2K)'},
@@ -667,6 +788,7 @@ def get_available_options():
                 {'code': 'calm', 'name': 'Calm'},
                 {'code': 'dramatic', 'name': 'Dramatic'}
             ],
+            'encoderProfiles': list_encoder_profiles(),
             'ai_features': {
                 'available': True,
                 'free_services': True,
@@ -751,10 +873,14 @@ def apply_template():
         data = request.json
         text = data.get('text')
         template_id = data.get('template_id')
+        encoder_profile = data.get('encoder_profile')
         
         if not text or not template_id:
             return jsonify({'error': 'Text and template_id required'}), 400
         
+        if not is_valid_encoder_profile(encoder_profile):
+            return jsonify({'error': f'Unknown encoder profile: {encoder_profile}'}), 400
+        
         # Lade Template
         templates_response = get_video_templates()
         templates = templates_response.get_json()
@@ -768,42 +894,49 @@ def apply_template():
         # Verwende Template-Einstellungen
         settings = template['settings']
         
-        # Generiere Audio
-        tts = TextToSpeech()
-        audio_file = tts.generate_speech(text)
-        
-        if not audio_file:
-            return jsonify({'error': 'Failed to generate audio'}), 500
-        
-        # Generiere Video basierend auf Template
-        if settings.get('ai_enhanced', False):
-            # Verwende FREE AI Generator
-            generator = FreeAIVideoGenerator()
-            video_file = generator.generate_professional_video(text)
+        def generate():
+            # Generiere Video basierend auf Template
+            if settings.get('ai_enhanced', False):
+                # FREE AI Generator: TTS und AI-Video parallel
+                results = build_ai_video_pipeline(text, text, encoder_profile=encoder_profile).run()
+                audio_file = results['tts']
+                video_file = results['combine']
+            else:
+                # Generiere Audio
+                tts = TextToSpeech()
+                audio_file = tts.generate_speech(text)
+                
+                if not audio_file:
+                    raise RuntimeError('Failed to generate audio')
+                
+                # Verwende Standard Generator (im Render-Prozess)
+                video_file = get_render_pool().run(render_slide_video, audio_file, text,
+                                                   encoder_profile=encoder_profile,
+                                                   slide_file=get_slide_image(text))
             
-            if video_file:
-                # Kombiniere mit Audio
-                final_video = combine_video_with_audio(video_file, audio_file)
-                video_file = final_video if final_video else video_file
-        else:
-            # Verwende Standard Generator
-            video_generator = VideoGenerator()
-            video_file = video_generator.create_video(audio_file, text)
-        
-        if not video_file:
-            return jsonify({'error': 'Failed to generate video'}), 500
+            if not video_file:
+                raise RuntimeError('Failed to generate video')
+            
+            # URLs erstellen
+            return {
+                'success': True,
+                'url': f"/output/{os.path.basename(video_file)}",
+                'audio_url': f"/output/{os.path.basename(audio_file)}",
+                'template_used': template,
+                'settings_applied': settings
+            }
         
-        # URLs erstellen
-        video_url = f"/output/{os.path.basename(video_file)}"
-        audio_url = f"/output/{os.path.basename(audio_file)}"
+        try:
+            cache_key = ResultCache.make_key('template', text=text, template_id=template_id,
+                                             encoder_profile=encoder_profile)
+            start_time = time.time()
+            with collect_timings() as timings:
+                result, cache_status = result_cache.run(cache_key, generate)
+        except RuntimeError as e:
+            return jsonify({'error': str(e)}), 500
         
-        return jsonify({
-            'success': True,
-            'url': video_url,
-            'audio_url': audio_url,
-            'template_used': template,
-            'settings_applied': settings
-        }), 200
+        return jsonify(dict(result, cached=cache_status != 'miss', processing_time=round(time.time() - start_time, 3),
+                            timings=timings)), 200
         
     except Exception as e:
         print(f"❌ Template application error: {str(e)}")
@@ -812,98 +945,46 @@ def apply_template():
 @app.route('/api/batch-generate', methods=['POST'])
 def batch_generate():
     """
-    Generiert mehrere Videos auf einmal
+    Generiert mehrere Videos parallel.
+    Mit options.stream=true wird jedes Ergebnis als NDJSON-Zeile gestreamt, sobald es fertig ist.
     """
     try:
         data = request.json
         texts = data.get('texts', [])
         options = data.get('options', {})
         use_ai = options.get('use_ai', False)
+        stream = options.get('stream', False)
+        encoder_profile = options.get('encoder_profile')
         
         if not texts or len(texts) == 0:
             return jsonify({'error': 'No texts provided'}), 400
         
-        if len(texts) > 10:
-            return jsonify({'error': 'Maximum 10 texts allowed per batch'}), 400
+        if not is_valid_encoder_profile(encoder_profile):
+            return jsonify({'error': f'Unknown encoder profile: {encoder_profile}'}), 400
         
-        print(f"🎬 Batch generating {len(texts)} videos (AI: {use_ai})...")
+        if len(texts) > batch_executor.max_items:
+            return jsonify({'error': f'Maximum {batch_executor.max_items} texts allowed per batch'}), 400
         
-        results = []
+        print(f"🎬 Batch generating {len(texts)} videos (AI: {use_ai}, stream: {stream})...")
         
-        for i, text in enumerate(texts):
-            try:
-                print(f"📹 Processing video {i+1}/{len(texts)}: {text[:50]}...")
-                
-                # Generiere Audio
-                tts = TextToSpeech()
-                audio_file = tts.generate_speech(text)
-                
-                if not audio_file:
-                    results.append({
-                        'index': i,
-                        'text': text,
-                        'success': False,
-                        'error': 'Failed to generate audio'
-                    })
-                    continue
-                
-                # Generiere Video
-                if use_ai:
-                    # Verwende FREE AI Generator
-                    generator = FreeAIVideoGenerator()
-                    video_file = generator.generate_professional_video(text)
-                    
-                    if video_file:
-                        # Kombiniere mit Audio
-                        final_video = combine_video_with_audio(video_file, audio_file)
-                        video_file = final_video if final_video else video_file
-                else:
-                    # Verwende Standard Generator
-                    video_generator = VideoGenerator()
-                    video_file = video_generator.create_video(audio_file, text)
-                
-                if not video_file:
-                    results.append({
-                        'index': i,
-                        'text': text,
-                        'success': False,
-                        'error': 'Failed to generate video'
-                    })
-                    continue
-                
-                # Erfolg
-                video_url = f"/output/{os.path.basename(video_file)}"
-                audio_url = f"/output/{os.path.basename(audio_file)}"
-                
-                results.append({
-                    'index': i,
-                    'text': text,
-                    'success': True,
-                    'video_url': video_url,
-                    'audio_url': audio_url,
-                    'ai_generated': use_ai
-                })
-                
-            except Exception as e:
-                results.append({
-                    'index': i,
-                    'text': text,
-                    'success': False,
-                    'error': str(e)
-                })
-        
-        # Statistiken
-        successful = len([r for r in results if r['success']])
-        failed = len(results) - successful
+        if stream:
+            def generate():
+                results = []
+                for result in batch_executor.run(texts, use_ai, encoder_profile):
+                    results.append(result)
+                    yield json.dumps({'type': 'item', 'result': result}) + '\n'
+                yield json.dumps({
+                    'type': 'done',
+                    'statistics': BatchExecutor.get_statistics(results, len(texts))
+                }) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        results = sorted(batch_executor.run(texts, use_ai, encoder_profile), key=lambda r: r['index'])
         
         return jsonify({
             'batch_results': results,
-            'statistics': {
-                'total': len(texts),
-                'successful': successful,
-                'failed': failed,
-                'success_rate': round((successful / len(texts)) * 100, 1)
-            }
+            'statistics': BatchExecutor.get_statistics(results, len(texts))
         }), 200
         
     except Exception as e:
@@ -919,6 +1000,11 @@ if __name__ == '__main__':
     music_dir = os.path.join(output_dir, 'music')
     os.makedirs(music_dir, exist_ok=True)
     
+    # Render-Worker vorab starten (MoviePy/NumPy bereits importiert) - nicht im
+    # Reloader-Elternprozess, sonst gäbe es einen zweiten, ungenutzten Pool
+    if is_serving_process():
+        get_render_pool().warm_up()
+    
     print("\n" + "="*70)
     print("🆓 FREE AI TEXT-TO-VIDEO CONVERTER API SERVER v3.0")
     print("="*70)
@@ -928,7 +1014,10 @@ if __name__ == '__main__':
     print("\n📋 Available endpoints:")
     print("  🆓 POST /api/generate-free-ai-video     - Generate FREE AI video")
     print("  🎬 POST /api/generate-ai-video          - Generate AI video (with fallback)")
+    print("  📋 GET  /api/jobs/<job_id>              - Job status and result")
+    print("  📡 GET  /api/jobs/<job_id>/events       - Job progress stream (SSE)")
     print("  🎬 POST /api/generate-video             - Generate standard video")
+    print("  👀 POST /api/preview                    - Fast low-res preview")
     print("  🔊 POST /api/tts                        - Text to speech conversion")
     print("  📹 POST /api/video                      - Generate video from audio")
     print("  🧪 GET  /api/test-free-services         - Test all free services")
@@ -947,6 +1036,7 @@ if __name__ == '__main__':
     print("  🎵 GET  /api/video/music                - Get music options")
     print("  ❤️  GET  /api/health                    - Health check")
     print("  📊 GET  /api/status                     - System status")
+    print("  📈 GET  /metrics                        - Prometheus metrics")
     print("  🧹 POST /api/cleanup                    - Cleanup old files")
     print("  📁 GET  /output/<filename>              - Serve generated files")
     print("="*70)
@@ -995,4 +1085,4 @@ if __name__ == '__main__':
     print("="*70 + "\n")
     
     # Starte den Server
-    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
+    app.run(debug=True, use_reloader=USE_RELOADER, host='0.0.0.0', port=5000, threaded=True)
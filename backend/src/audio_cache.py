@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from storage_manager import get_storage_manager
+from metrics import CACHE_REQUESTS
+
+
+class AudioCache:
+    """
+    Inhaltsadressierter Cache für TTS-Audiodateien (und andere Render-Artefakte).
+    Der Schlüssel wird aus allen Syntheseparametern gebildet, Dateien werden
+    atomar geschrieben und per LRU auf eine Maximalgröße begrenzt.
+    """
+
+    INDEX_FILENAME = '.tts_cache_index.json'
+
+    def __init__(self, cache_dir: str, max_bytes: int = None, prefix: str = 'tts_', index_filename: str = None):
+        self.cache_dir = cache_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('TTS_CACHE_MAX_MB', '500')) * 1024 * 1024
+        self.index_path = os.path.join(cache_dir, index_filename or self.INDEX_FILENAME)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._entries = OrderedDict()  # key -> {'file', 'size', 'created', 'last_access'}
+        self._load_index()
+        # Cache-Dateien verwaltet der Cache selbst (eigenes LRU-Limit): im Storage-Index
+        # gepinnt, damit TTL/Quota-Sweep keine heißen Einträge löscht
+        storage = get_storage_manager()
+        for entry in list(self._entries.values()):
+            storage.register(entry['file'], pinned=True)
+
+    @staticmethod
+    def make_key(**params) -> str:
+        """Stabiler Hash über alle Syntheseparameter"""
+        canonical = json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str, ext: str = 'mp3') -> str:
+        return os.path.join(self.cache_dir, f"{self.prefix}{key}.{ext}")
+
+    def get(self, key: str):
+        """Gibt den Pfad einer gecachten Datei zurück oder None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and not os.path.exists(entry['file']):
+                # Datei wurde extern gelöscht
+                del self._entries[key]
+                return None
+            if not entry:
+                return None
+            entry['last_access'] = time.time()
+            self._entries.move_to_end(key)
+            file_path = entry['file']
+        get_storage_manager().touch(os.path.basename(file_path))
+        return file_path
+
+    def get_or_create(self, key: str, synthesize, ext: str = 'mp3') -> str:
+        """
+        Liefert die gecachte Datei oder erzeugt sie über synthesize(tmp_path).
+        Pro Schlüssel synthetisiert nur ein Thread, andere warten auf das Ergebnis.
+        """
+        cached = self.get(key)
+        if cached:
+            self._count(hit=True)
+            return cached
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Ein anderer Thread könnte die Datei inzwischen erzeugt haben
+            cached = self.get(key)
+            if cached:
+                self._count(hit=True)
+                return cached
+
+            final_path = self.path_for(key, ext)
+            if os.path.exists(final_path):
+                # Von einem anderen Prozess (Render-Worker) erzeugt - Dateien sind
+                # inhaltsadressiert und atomar geschrieben, also direkt übernehmen
+                self._count(hit=True)
+                self.put(key, final_path)
+                with self._lock:
+                    self._key_locks.pop(key, None)
+                return final_path
+
+            self._count(hit=False)
+            # Temp-Datei behält die Endung, damit FFmpeg das Format erkennt
+            tmp_path = f"{final_path[:-len(ext) - 1]}.{threading.get_ident()}.tmp.{ext}"
+            try:
+                synthesize(tmp_path)
+                os.replace(tmp_path, final_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+            self.put(key, final_path)
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+
+        return final_path
+
+    def put(self, key: str, file_path: str):
+        """Registriert eine fertige Datei im Index und räumt per LRU auf"""
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {
+                'file': file_path,
+                'size': os.path.getsize(file_path),
+                'created': now,
+                'last_access': now
+            }
+            self._entries.move_to_end(key)
+            self._evict(keep=key)
+            self._save_index()
+        get_storage_manager().register(file_path, pinned=True)
+
+    def _count(self, hit: bool):
+        CACHE_REQUESTS.inc(cache=self.prefix.rstrip('_'), result='hit' if hit else 'miss')
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _evict(self, keep: str = None):
+        """Entfernt die am längsten ungenutzten Dateien über dem Limit"""
+        total = sum(entry['size'] for entry in self._entries.values())
+        for key in list(self._entries.keys()):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            total -= entry['size']
+            try:
+                os.remove(entry['file'])
+                print(f"🧹 Cache evicted: {os.path.basename(entry['file'])}")
+            except OSError:
+                pass
+            get_storage_manager().forget(entry['file'])
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = sorted(data.get('entries', {}).items(), key=lambda item: item[1].get('last_access', 0))
+            for key, entry in entries:
+                if os.path.exists(entry.get('file', '')):
+                    self._entries[key] = entry
+        except (OSError, ValueError):
+            pass
+
+    def _save_index(self):
+        # Eindeutiger Temp-Name: mehrere Prozesse dürfen sich nicht gegenseitig überschreiben
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': dict(self._entries)}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ Could not save TTS cache index: {e}")
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'size_mb': round(sum(entry['size'] for entry in self._entries.values()) / (1024 * 1024), 2),
+                'max_size_mb': round(self.max_bytes / (1024 * 1024), 2),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 1) if total else 0.0
+            }
@@ -0,0 +1,89 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tts import TextToSpeech
+from render_tasks import combine_video_with_audio, render_slide_video
+from video_generator import get_slide_image
+from pipeline_dag import build_ai_video_pipeline
+from render_pool import get_render_pool
+from metrics import collect_timings
+
+
+class BatchExecutor:
+    """
+    Parallele Batch-Verarbeitung:
+    - Thread-Pool für I/O-lastige Schritte (TTS, AI-Provider)
+    - gemeinsamer Render-Prozess-Pool für CPU-lastige MoviePy/FFmpeg-Encodes
+    Ergebnisse werden pro Item geliefert, sobald es fertig ist.
+    """
+
+    def __init__(self, io_workers: int = None, max_items: int = None):
+        self.io_workers = io_workers or int(os.getenv('BATCH_IO_WORKERS', '0')) or 8
+        self.max_items = max_items or int(os.getenv('BATCH_MAX_ITEMS', '10'))
+        self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix='batch-io')
+        self.render_pool = get_render_pool()
+        print(f"📦 Batch executor initialized (io: {self.io_workers}, render: {self.render_pool.workers}, max items: {self.max_items})")
+
+    def _render(self, func, *args, **kwargs):
+        """Führt einen Encode im gemeinsamen Render-Prozess-Pool aus"""
+        return self.render_pool.run(func, *args, **kwargs)
+
+    def _process_item(self, index: int, text: str, use_ai: bool, encoder_profile: str = None) -> dict:
+        """Komplette Pipeline für ein Batch-Item"""
+        try:
+            print(f"📹 Processing video {index + 1}: {text[:50]}...")
+            start_time = time.time()
+
+            with collect_timings() as timings:
+                if use_ai:
+                    # TTS und AI-Video parallel, Mux im Prozess-Pool
+                    combine = lambda video_file, audio_file: self._render(combine_video_with_audio, video_file,
+                                                                          audio_file, encoder_profile=encoder_profile)
+                    results = build_ai_video_pipeline(text, text, combine=combine).run()
+                    audio_file = results['tts']
+                    video_file = results['combine']
+                else:
+                    # Generiere Audio
+                    tts = TextToSpeech()
+                    audio_file = tts.generate_speech(text)
+
+                    if not audio_file:
+                        return {'index': index, 'text': text, 'success': False, 'error': 'Failed to generate audio'}
+
+                    video_file = self._render(render_slide_video, audio_file, text, encoder_profile=encoder_profile,
+                                              slide_file=get_slide_image(text))
+
+            if not video_file:
+                return {'index': index, 'text': text, 'success': False, 'error': 'Failed to generate video'}
+
+            return {
+                'index': index,
+                'text': text,
+                'success': True,
+                'video_url': f"/output/{os.path.basename(video_file)}",
+                'audio_url': f"/output/{os.path.basename(audio_file)}",
+                'ai_generated': use_ai,
+                'processing_time': round(time.time() - start_time, 3),
+                'timings': timings
+            }
+
+        except Exception as e:
+            return {'index': index, 'text': text, 'success': False, 'error': str(e)}
+
+    def run(self, texts, use_ai: bool = False, encoder_profile: str = None):
+        """Generator: liefert die Item-Ergebnisse in Fertigstellungs-Reihenfolge"""
+        futures = [self._io_pool.submit(self._process_item, i, text, use_ai, encoder_profile)
+                   for i, text in enumerate(texts)]
+        for future in as_completed(futures):
+            yield future.result()
+
+    @staticmethod
+    def get_statistics(results, total: int) -> dict:
+        successful = len([r for r in results if r['success']])
+        return {
+            'total': total,
+            'successful': successful,
+            'failed': len(results) - successful,
+            'success_rate': round((successful / total) * 100, 1) if total else 0.0
+        }
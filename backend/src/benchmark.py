@@ -0,0 +1,347 @@
+"""
+Offline-Benchmarks für die Render- und Mux-Hot-Paths (ohne Netzwerk).
+
+Jeder Fall läuft in einem eigenen Python-Prozess, damit Peak-RSS und CPU-Zeit
+(inkl. FFmpeg-Kindprozesse) pro Fall gemessen werden. Eingaben sind synthetisch
+(Sinus-Audio, Farbverlauf-Bild), gTTS wird durch einen lokalen FFmpeg-Stub ersetzt.
+
+Beispiele:
+    python benchmark.py                      # alle Fälle
+    python benchmark.py --filter create_video:720p
+    python benchmark.py --save               # Ergebnisse als Baseline speichern
+    python benchmark.py --compare            # gegen Baseline prüfen (Exit-Code 1 bei Regression)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, 'benchmarks', 'baseline.json')
+
+RESOLUTIONS = ('720p', '1080p', '1440p', '2160p')
+STYLES = ('explainer', 'minimal', 'presentation', 'tutorial')
+SLIDE_SECONDS = 5.0
+SLIDE_FPS = 30
+
+SHORT_TEXT = "Dies ist ein kurzer Benchmark-Satz für die Sprachausgabe."
+LONG_TEXT = " ".join(
+    f"Satz Nummer {i} beschreibt einen Abschnitt des Benchmark-Skripts mit etwas Inhalt." for i in range(12)
+)
+
+
+# --- Synthetische Eingaben ---
+
+def make_sine_audio(path: str, seconds: float):
+    """Sinuston über FFmpeg (lavfi), Format aus der Dateiendung"""
+    from ffmpeg_tools import run_ffmpeg
+    if not run_ffmpeg(['-f', 'lavfi', '-i', f"sine=frequency=440:duration={seconds:.3f}", path]):
+        raise RuntimeError(f"Could not create synthetic audio: {path}")
+    return path
+
+
+def make_gradient_image(path: str, size=(1280, 720)):
+    """Farbverlauf mit etwas Struktur, damit Zoom-Frames nicht trivial sind"""
+    import numpy as np
+    from PIL import Image
+    width, height = size
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    frame = np.stack([
+        np.broadcast_to(x, (height, width)),
+        np.broadcast_to(y, (height, width)),
+        (x[None, :] * 0.5 + y * 0.5) % 64 * 4
+    ], axis=-1).astype(np.uint8)
+    Image.fromarray(frame).save(path)
+    return path
+
+
+class StubGTTS:
+    """Ersatz für gTTS: erzeugt lokal eine MP3 mit textlängenabhängiger Dauer"""
+
+    def __init__(self, text, lang='de', slow=False):
+        self.text = text
+
+    def save(self, path):
+        from ffmpeg_tools import run_ffmpeg
+        seconds = max(0.5, len(self.text) / 15)
+        if not run_ffmpeg(['-f', 'lavfi', '-i', f"sine=frequency=220:duration={seconds:.3f}",
+                           '-c:a', 'libmp3lame', '-b:a', '64k', path]):
+            raise RuntimeError('Stub TTS failed')
+
+
+# --- Benchmark-Fälle (Setup ungemessen, run() gemessen) ---
+
+def case_create_video(workdir, resolution, style):
+    import video_generator
+    from audio_cache import AudioCache
+    from video_generator import VideoGenerator
+    audio_file = make_sine_audio(os.path.join(workdir, 'audio.mp3'), SLIDE_SECONDS)
+    output_file = os.path.join(workdir, 'slide.mp4')
+    text = "Benchmark Slide\nmit zwei Zeilen Text"
+    runs = []
+
+    def run():
+        # Kalter Slide-Cache im Temp-Ordner für jeden Durchlauf (nicht backend/output)
+        runs.append(1)
+        video_generator._slide_cache = AudioCache(os.path.join(workdir, f"slide_cache_{len(runs)}"),
+                                                  prefix='slide_')
+        if not VideoGenerator().create_video(audio_file, text, resolution=resolution, style=style,
+                                             output_file=output_file):
+            raise RuntimeError('create_video failed')
+        return {'frames': int(SLIDE_SECONDS * SLIDE_FPS)}
+    return run
+
+
+def case_combine(workdir, audio_seconds, reencode=False):
+    from render_tasks import combine_video_with_audio, render_image_video, _combine_reencode
+    image = make_gradient_image(os.path.join(workdir, 'image.png'))
+    video_file = render_image_video(image, os.path.join(workdir, 'clip.mp4'), (1024, 576), 4.0, 24)
+    audio_file = make_sine_audio(os.path.join(workdir, 'audio.mp3'), audio_seconds)
+
+    def run():
+        if reencode:
+            _combine_reencode(video_file, audio_file, os.path.join(workdir, 'combined.mp4'))
+        else:
+            result = combine_video_with_audio(video_file, audio_file)
+            if not result or result == video_file:
+                raise RuntimeError('combine failed')
+            os.remove(result)
+        return {'frames': int(audio_seconds * 24)}
+    return run
+
+
+def case_ken_burns(workdir, size=(1024, 576), duration=4.0, fps=24):
+    from PIL import Image
+    from ken_burns import KenBurnsRenderer
+    image = Image.open(make_gradient_image(os.path.join(workdir, 'image.png')))
+
+    def run():
+        renderer = KenBurnsRenderer(image, size=size, duration=duration, fps=fps, zoom_start=1.0, zoom_end=1.1)
+        frames = sum(1 for _ in renderer.iter_frames())
+        return {'frames': frames}
+    return run
+
+
+def case_tts(workdir, text, warm=False):
+    import tts
+    from audio_cache import AudioCache
+    tts.gTTS = StubGTTS
+    tts._audio_cache = AudioCache(os.path.join(workdir, 'tts_cache'))
+    speaker = tts.TextToSpeech()
+    if warm:
+        speaker.generate_speech(text)
+    runs = []
+
+    def run():
+        if not warm:
+            # Kalter Cache für jeden Durchlauf
+            runs.append(1)
+            speaker.cache = AudioCache(os.path.join(workdir, f"tts_cache_{len(runs)}"))
+        if not speaker.generate_speech(text):
+            raise RuntimeError('generate_speech failed')
+        return {}
+    return run
+
+
+def build_cases():
+    cases = {}
+    for resolution in RESOLUTIONS:
+        for style in STYLES:
+            cases[f"create_video:{resolution}:{style}"] = (case_create_video, (resolution, style))
+    cases['combine:short'] = (case_combine, (3.0,))
+    cases['combine:long'] = (case_combine, (30.0,))
+    cases['combine:reencode'] = (case_combine, (10.0, True))
+    cases['ken_burns:1024x576'] = (case_ken_burns, ())
+    cases['tts:short'] = (case_tts, (SHORT_TEXT,))
+    cases['tts:long'] = (case_tts, (LONG_TEXT,))
+    cases['tts:long_warm'] = (case_tts, (LONG_TEXT, True))
+    return cases
+
+
+# --- Messung ---
+
+def _cpu_seconds():
+    if resource is None:
+        return time.process_time()
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    # Linux liefert KB, macOS Bytes
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / scale, 1)
+
+
+def run_case(name: str, repeat: int) -> dict:
+    """Führt einen Fall im aktuellen Prozess aus (Aufruf über --case)"""
+    factory, args = build_cases()[name]
+    workdir = tempfile.mkdtemp(prefix='bench_')
+    try:
+        run = factory(workdir, *args)
+        walls = []
+        cpu_start = _cpu_seconds()
+        extra = {}
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extra = run() or {}
+            walls.append(time.perf_counter() - start)
+        cpu = (_cpu_seconds() - cpu_start) / repeat
+
+        wall = min(walls)
+        result = {
+            'wall_s': round(wall, 4),
+            'wall_mean_s': round(sum(walls) / len(walls), 4),
+            'cpu_s': round(cpu, 4),
+            'peak_rss_mb': _peak_rss_mb(),
+            'repeat': repeat
+        }
+        if extra.get('frames'):
+            result['frames'] = extra['frames']
+            result['fps'] = round(extra['frames'] / wall, 1) if wall else None
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_isolated(name: str, repeat: int) -> dict:
+    """Startet den Fall in einem frischen Prozess (eigenes Peak-RSS, kein Warm-Cache)"""
+    env = dict(os.environ, RENDER_WORKERS='0')
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', name, '--repeat', str(repeat)],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    lines = [line for line in proc.stdout.decode('utf-8', errors='ignore').splitlines() if line.startswith('{')]
+    if proc.returncode != 0 or not lines:
+        error = proc.stderr.decode('utf-8', errors='ignore').strip()[-300:]
+        return {'error': error or f"exit code {proc.returncode}"}
+    return json.loads(lines[-1])
+
+
+# --- Baselines ---
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(path: str, results: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        'meta': {
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'results': results
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    print(f"💾 Baseline saved: {path}")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Gibt die Fälle zurück, deren Wall-Zeit mehr als threshold über der Baseline liegt"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or 'wall_s' not in result or 'wall_s' not in base:
+            continue
+        ratio = result['wall_s'] / base['wall_s'] if base['wall_s'] else 1.0
+        result['baseline_wall_s'] = base['wall_s']
+        result['change_percent'] = round((ratio - 1) * 100, 1)
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def print_table(results: dict):
+    print(f"\n{'case':<36}{'wall s':>9}{'cpu s':>9}{'rss MB':>9}{'fps':>9}{'vs base':>10}")
+    print('-' * 82)
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:<36}  ❌ {result['error'][:40]}")
+            continue
+        change = result.get('change_percent')
+        print(f"{name:<36}{result['wall_s']:>9.3f}{result['cpu_s']:>9.3f}"
+              f"{result['peak_rss_mb'] if result['peak_rss_mb'] is not None else '-':>9}"
+              f"{result.get('fps', '-'):>9}"
+              f"{(f'{change:+.1f}%' if change is not None else '-'):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmarks for render and mux hot paths')
+    parser.add_argument('--filter', default='', help='Only run cases containing this substring')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (best wall time is reported)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON path')
+    parser.add_argument('--save', action='store_true', help='Store results as the new baseline')
+    parser.add_argument('--compare', action='store_true', help='Fail on regressions against the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown (0.2 = 20%%)')
+    parser.add_argument('--output', help='Also write results to this JSON file')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # Kindprozess: ein Fall, Ergebnis als letzte JSON-Zeile
+        print(json.dumps(run_case(args.case, args.repeat)))
+        return 0
+
+    names = [name for name in build_cases() if args.filter in name]
+    if not names:
+        print(f"❌ No benchmark cases match '{args.filter}'")
+        return 2
+
+    print(f"⏱️ Running {len(names)} benchmark cases ({args.repeat} runs each)...")
+    results = {}
+    for name in names:
+        results[name] = run_isolated(name, args.repeat)
+        status = '❌' if 'error' in results[name] else '✅'
+        print(f"{status} {name}")
+
+    baseline = load_baseline(args.baseline).get('results', {})
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+
+    if args.compare:
+        if not baseline:
+            print(f"⚠️ No baseline found at {args.baseline}")
+        elif regressions:
+            print(f"\n❌ Regressions over {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+            return 1
+        else:
+            print("\n✅ No regressions against baseline")
+
+    failed = [name for name, result in results.items() if 'error' in result]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import os
+from ffmpeg_tools import get_encoder_threads
+
+
+class EncoderProfile:
+    """
+    Benannter H.264-Encoder-Preset: x264-Preset, CRF (optional mit Bitraten-Obergrenze),
+    Threads und GOP-Länge. Alle Render-Pfade (FFmpeg direkt und MoviePy) nutzen dieselben Werte.
+    """
+
+    def __init__(self, name: str, label: str, preset: str, crf: int, max_bitrate: str = None,
+                 gop_seconds: float = 2.0, threads: int = None, description: str = ''):
+        self.name = name
+        self.label = label
+        self.preset = preset
+        self.crf = crf
+        self.max_bitrate = max_bitrate
+        self.gop_seconds = gop_seconds
+        self.threads = threads
+        self.description = description
+
+    def get_threads(self):
+        """Profil-Threads, sonst die Vorgabe des Render-Workers (RENDER_THREADS)"""
+        return self.threads or get_encoder_threads()
+
+    def _rate_args(self, fps: int) -> list:
+        args = ['-crf', self.crf]
+        if self.max_bitrate:
+            # Bitraten-Obergrenze für CRF (VBV), Puffer = doppelte Rate
+            args += ['-maxrate', self.max_bitrate, '-bufsize', f"{int(self.max_bitrate.rstrip('k')) * 2}k"]
+        gop = max(1, int(round(fps * self.gop_seconds)))
+        args += ['-g', gop, '-keyint_min', min(gop, int(fps))]
+        return [str(arg) for arg in args]
+
+    def ffmpeg_args(self, fps: int) -> list:
+        """Video-Encoder-Argumente für einen direkten FFmpeg-Aufruf"""
+        args = ['-c:v', 'libx264', '-preset', self.preset] + self._rate_args(fps)
+        threads = self.get_threads()
+        if threads:
+            args += ['-threads', str(threads)]
+        return args
+
+    def moviepy_params(self, fps: int) -> dict:
+        """Keyword-Argumente für MoviePy write_videofile"""
+        return {
+            'codec': 'libx264',
+            'preset': self.preset,
+            'threads': self.get_threads(),
+            'ffmpeg_params': self._rate_args(fps)
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            'code': self.name,
+            'name': self.label,
+            'description': self.description,
+            'preset': self.preset,
+            'crf': self.crf,
+            'max_bitrate': self.max_bitrate,
+            'gop_seconds': self.gop_seconds,
+            'threads': self.threads
+        }
+
+
+ENCODER_PROFILES = {
+    profile.name: profile for profile in (
+        EncoderProfile('preview-ultrafast', 'Vorschau (schnell)', preset='ultrafast', crf=30,
+                       max_bitrate='1500k', gop_seconds=2.0,
+                       description='Minimale Encode-Zeit, größere Dateien, für Vorschauen'),
+        EncoderProfile('balanced', 'Ausgewogen', preset='veryfast', crf=23,
+                       max_bitrate='5000k', gop_seconds=2.0,
+                       description='Standard für finale Videos'),
+        EncoderProfile('archive', 'Archiv (klein)', preset='slow', crf=20,
+                       gop_seconds=10.0,
+                       description='Langsamer Encode, kleinste Dateien bei hoher Qualität'),
+    )
+}
+
+DEFAULT_PROFILE = os.getenv('ENCODER_PROFILE', 'balanced')
+DEFAULT_PREVIEW_PROFILE = os.getenv('PREVIEW_ENCODER_PROFILE', 'preview-ultrafast')
+
+
+def get_encoder_profile(name: str = None, is_preview: bool = False) -> EncoderProfile:
+    """
+    Liefert das Profil zum Namen, ohne Namen das Standardprofil
+    (für Vorschauen PREVIEW_ENCODER_PROFILE, sonst ENCODER_PROFILE).
+    """
+    if not name:
+        name = DEFAULT_PREVIEW_PROFILE if is_preview else DEFAULT_PROFILE
+    profile = ENCODER_PROFILES.get(name)
+    if profile is None:
+        raise ValueError(f"Unknown encoder profile: {name}")
+    return profile
+
+
+def list_encoder_profiles() -> list:
+    """Profile für /api/options"""
+    return [profile.to_dict() for profile in ENCODER_PROFILES.values()]
@@ -0,0 +1,136 @@
+import os
+import re
+import subprocess
+
+
+def get_ffmpeg_binary() -> str:
+    """Gleiche FFmpeg-Binary wie MoviePy (lokale ffmpeg.exe oder imageio-ffmpeg)"""
+    try:
+        from moviepy.config import get_setting
+        return get_setting("FFMPEG_BINARY")
+    except Exception:
+        local_ffmpeg = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ffmpeg', 'ffmpeg.exe')
+        return local_ffmpeg if os.path.exists(local_ffmpeg) else 'ffmpeg'
+
+
+def get_encoder_threads():
+    """Encoder-Threads pro Render-Worker (RENDER_THREADS), None = FFmpeg entscheidet"""
+    threads = int(os.getenv('RENDER_THREADS', '0'))
+    return threads or None
+
+
+def run_ffmpeg(args, timeout: float = 600) -> bool:
+    """
+    Führt FFmpeg mit den übergebenen Argumenten aus.
+    Gibt True bei Erfolg zurück, sonst False (stderr wird geloggt).
+    """
+    cmd = [get_ffmpeg_binary(), '-y', '-hide_banner', '-loglevel', 'error'] + [str(arg) for arg in args]
+    threads = get_encoder_threads()
+    if threads and '-threads' not in cmd:
+        # Globale Option vor der Ausgabedatei
+        cmd[-1:-1] = ['-threads', str(threads)]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
+        if result.returncode != 0:
+            print(f"❌ FFmpeg failed: {result.stderr.decode('utf-8', errors='ignore').strip()[-500:]}")
+            return False
+        return True
+    except Exception as e:
+        print(f"❌ FFmpeg error: {e}")
+        return False
+
+
+def encode_still_image(image_file: str, audio_file: str, output_file: str, duration: float,
+                       fps: int = 30, profile=None) -> bool:
+    """
+    Kodiert ein einzelnes Standbild mit Audio (-loop 1 -tune stillimage).
+    Für statische Slides deutlich schneller als Frame-für-Frame-Rendering.
+    profile ist ein EncoderProfile (Preset, CRF, GOP, Threads).
+    """
+    video_args = profile.ffmpeg_args(fps) if profile else ['-c:v', 'libx264']
+    return run_ffmpeg([
+        '-loop', 1, '-framerate', fps, '-i', image_file,
+        '-i', audio_file,
+        '-t', f"{duration:.3f}"
+    ] + video_args + [
+        '-tune', 'stillimage',
+        '-pix_fmt', 'yuv420p', '-r', fps,
+        '-c:a', 'aac',
+        '-shortest',
+        '-movflags', '+faststart',
+        output_file
+    ])
+
+
+def probe_media(file_path: str) -> dict:
+    """
+    Liest Dauer und Codecs über 'ffmpeg -i' aus (ffprobe ist nicht immer vorhanden).
+    Gibt ein Dict mit duration, video_codec, pix_fmt und audio_codec zurück.
+    """
+    info = {'duration': None, 'video_codec': None, 'pix_fmt': None, 'audio_codec': None}
+    try:
+        result = subprocess.run([get_ffmpeg_binary(), '-hide_banner', '-i', file_path],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=30)
+        output = result.stderr.decode('utf-8', errors='ignore')
+    except Exception as e:
+        print(f"❌ FFmpeg probe error: {e}")
+        return info
+
+    duration = re.search(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)', output)
+    if duration:
+        hours, minutes, seconds = duration.groups()
+        info['duration'] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    video = re.search(r'Stream #\S+.*?: Video: (\w+)[^,]*, (\w+)', output)
+    if video:
+        info['video_codec'], info['pix_fmt'] = video.group(1), video.group(2)
+
+    audio = re.search(r'Stream #\S+.*?: Audio: (\w+)', output)
+    if audio:
+        info['audio_codec'] = audio.group(1)
+
+    return info
+
+
+def can_stream_copy(video_info: dict) -> bool:
+    """Browser-kompatibles H.264 (yuv420p) kann ohne Re-Encode in MP4 übernommen werden"""
+    return video_info.get('video_codec') == 'h264' and video_info.get('pix_fmt') in ('yuv420p', 'yuvj420p')
+
+
+def mux_stream_copy(video_file: str, audio_file: str, output_file: str, duration: float,
+                    audio_codec: str = None) -> bool:
+    """
+    Legt Audio unter ein (ggf. geloopt wiederholtes) Video ohne Video-Re-Encode:
+    -stream_loop -1 + -c:v copy, geschnitten auf die Audiolänge.
+    MP3/AAC-Audio wird ebenfalls nur kopiert.
+    """
+    audio_args = ['-c:a', 'copy'] if audio_codec in ('mp3', 'aac') else ['-c:a', 'aac']
+    return run_ffmpeg([
+        '-stream_loop', -1, '-i', video_file,
+        '-i', audio_file,
+        '-map', '0:v:0', '-map', '1:a:0',
+        '-c:v', 'copy'
+    ] + audio_args + [
+        '-t', f"{duration:.3f}",
+        '-shortest',
+        '-movflags', '+faststart',
+        output_file
+    ])
+
+
+def concat_files(input_files, output_file: str, extra_args=None) -> bool:
+    """
+    Hängt gleichartig kodierte Dateien per Concat-Demuxer ohne Re-Encode aneinander
+    (-f concat -c copy). Die Eingaben müssen identische Codec-Parameter haben.
+    """
+    list_file = f"{output_file}.concat.txt"
+    try:
+        with open(list_file, 'w', encoding='utf-8') as f:
+            for input_file in input_files:
+                escaped = os.path.abspath(input_file).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        return run_ffmpeg(['-f', 'concat', '-safe', 0, '-i', list_file, '-c', 'copy']
+                          + list(extra_args or []) + [output_file])
+    finally:
+        if os.path.exists(list_file):
+            os.remove(list_file)
@@ -1,15 +1,98 @@
-import requests
 import time
 import os
 from typing import Optional
 import hashlib
-import numpy as np
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from provider_health import get_health_registry
+from gradio_pool import get_gradio_pool
+from http_transport import get_http_transport
+from render_pool import get_render_pool
+from render_tasks import render_image_video
+from storage_manager import get_storage_manager, new_artifact_path, atomic_output
+from progress import report, propagate
+from metrics import time_stage, record_timing, PROVIDER_SECONDS, PROVIDER_FAILURES
+
+# Gemeinsamer Pool für parallele Provider-Aufrufe (Race-Modus)
+_provider_pool = ThreadPoolExecutor(max_workers=int(os.getenv('AI_PROVIDER_WORKERS', '16')),
+                                    thread_name_prefix='ai-provider')
+
+# Maximale Wartezeit auf einen HF Space (Gradio-Queue + Generierung), danach Abbruch
+HF_SPACE_TIMEOUT = float(os.getenv('HF_SPACE_TIMEOUT', '150'))
+
+# Große Download-Chunks (weniger Syscalls und Python-Overhead pro MB)
+DOWNLOAD_CHUNK_SIZE = int(os.getenv('DOWNLOAD_CHUNK_KB', '1024')) * 1024
 
 class FreeAIVideoGenerator:
-    def __init__(self, hf_token=None, replicate_token=None):
+    # AKTUELLE SPACES DIE FUNKTIONIEREN (Stand Juni 2025)
+    WORKING_HF_SPACES = [
+        {
+            "name": "Zeroscope v2 XL",
+            "space_id": "fffiloni/zeroscope-v2-xl",
+            "method": "zeroscope"
+        },
+        {
+            "name": "AnimateDiff Lightning",
+            "space_id": "ByteDance/AnimateDiff-Lightning",
+            "method": "animatediff"
+        },
+        {
+            "name": "I2VGen-XL",
+            "space_id": "ali-vilab/i2vgen-xl",
+            "method": "i2vgen"
+        },
+        {
+            "name": "LaVie",
+            "space_id": "Vchitect/LaVie",
+            "method": "lavie"
+        },
+        {
+            "name": "VideoCrafter",
+            "space_id": "VideoCrafter/VideoCrafter2",
+            "method": "videocrafter"
+        }
+    ]
+
+    # Liste öffentlicher APIs
+    PUBLIC_AI_APIS = [
+        {
+            "name": "Pollinations AI",
+            "url": "https://image.pollinations.ai/prompt/{prompt}?model=flux&width=1024&height=576&enhance=true&nologo=true",
+            "type": "image_to_video"
+        },
+        {
+            "name": "Dezgo AI",
+            "url": "https://api.dezgo.com/text2video",
+            "type": "text_to_video"
+        }
+    ]
+
+    # Community Services
+    COMMUNITY_SERVICES = [
+        {
+            "name": "DeepAI Text2Video",
+            "url": "https://api.deepai.org/api/text2vid",
+            "method": "deepai"
+        },
+        {
+            "name": "AI Video Generator",
+            "url": "https://api.aiforthat.com/v1/text-to-video",
+            "method": "aiforthat"
+        },
+        {
+            "name": "Free Video AI",
+            "url": "https://freevideoai.com/api/generate",
+            "method": "freevideoai"
+        }
+    ]
+
+    def __init__(self, hf_token=None, replicate_token=None, transport=None):
         self.hf_token = hf_token or os.getenv('HUGGINGFACE_TOKEN')
+        self.http = transport or get_http_transport()
         self.output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
         os.makedirs(self.output_dir, exist_ok=True)
+        self.health = get_health_registry()
+        self.gradio_pool = get_gradio_pool()
         print("🆓 Free AI Video Generator initialized (100% FREE APIs)")
         
         # Debug Token Status
@@ -18,34 +101,176 @@ class FreeAIVideoGenerator:
         else:
             print("🔑 HF Token: ❌ (optional for public spaces)")
         
-    def generate_professional_video(self, prompt: str) -> Optional[str]:
+    def generate_professional_video(self, prompt: str, mode: str = None, race_width: int = None,
+                                    deadline: float = None) -> Optional[str]:
         """
         🎯 100% KOSTENLOSE AI VIDEOS - NUR APIS
+        mode 'race' startet die ersten N Provider gleichzeitig und nimmt das erste
+        gültige Video, 'sequential' probiert alle Provider nacheinander.
         """
         print(f"🤖 === FREE AI VIDEO GENERATION ===")
         print(f"📝 Prompt: {prompt}")
         
-        # 1. Aktuelle HuggingFace Spaces (kostenlos)
-        video = self._try_working_hf_spaces(prompt)
-        if video: 
-            print("✅ HuggingFace Spaces SUCCESS!")
-            return video
-        
-        # 2. Public AI APIs (kostenlos)
-        video = self._try_public_ai_apis(prompt)
-        if video: 
-            print("✅ Public AI APIs SUCCESS!")
-            return video
+        mode = mode or os.getenv('AI_PROVIDER_MODE', 'race')
+        if mode == 'race':
+            return self._race_providers(prompt, race_width, deadline)
         
-        # 3. Community AI Services (kostenlos)
-        video = self._try_community_services(prompt)
-        if video: 
-            print("✅ Community Services SUCCESS!")
-            return video
+        # Sequentiell: Provider nacheinander in Health-Reihenfolge
+        for provider in self._get_provider_chain(prompt):
+            video = self._run_provider(provider)
+            if video:
+                print(f"✅ {provider['name']} SUCCESS! ({provider['category']})")
+                return video
         
         print("❌ ALL FREE AI VIDEO SERVICES FAILED")
         return None
     
+    def _get_provider_chain(self, prompt: str):
+        """Flache, geordnete Liste aller Provider-Aufrufe"""
+        enhanced_prompt = f"{prompt}, high quality, cinematic, smooth motion"
+        chain = []
+        
+        for space in self.WORKING_HF_SPACES:
+            chain.append({
+                'name': space['name'],
+                'category': 'working_hf_spaces',
+                'call': functools.partial(self._call_hf_space, space, enhanced_prompt),
+                # Gradio-Aufrufe haben keinen HTTP-Timeout - Restzeit der Deadline übergeben
+                'accepts_timeout': True
+            })
+        
+        for api in self.PUBLIC_AI_APIS:
+            call = self._call_text_to_video_api if api['type'] == 'text_to_video' else self._call_image_to_video_api
+            chain.append({
+                'name': api['name'],
+                'category': 'public_ai_apis',
+                'call': functools.partial(call, api, prompt)
+            })
+        
+        for service in self.COMMUNITY_SERVICES:
+            chain.append({
+                'name': service['name'],
+                'category': 'community_services',
+                'call': functools.partial(self._call_community_service, service, prompt)
+            })
+        
+        # Provider mit offenem Circuit Breaker überspringen, Rest nach Health sortieren
+        available = [provider for provider in chain if self.health.is_available(provider['name'])]
+        if not available:
+            print("⚠️ All provider circuits open, trying full chain")
+            available = chain
+        
+        return self.health.order(available, key=lambda provider: provider['name'])
+    
+    def _run_provider(self, provider, end_time: float = None):
+        """
+        Führt einen Provider aus, protokolliert Health und gibt nur gültige Videos zurück.
+        end_time (Race-Deadline) begrenzt Provider ohne eigenen HTTP-Timeout.
+        """
+        start_time = time.time()
+        report('provider', provider=provider['name'], status='attempt')
+        try:
+            print(f"🚀 Trying {provider['name']}...")
+            kwargs = {}
+            if provider.get('accepts_timeout'):
+                remaining = end_time - start_time if end_time else HF_SPACE_TIMEOUT
+                kwargs['timeout'] = max(1.0, min(HF_SPACE_TIMEOUT, remaining))
+            video_path = provider['call'](**kwargs)
+            latency = time.time() - start_time
+            if self._is_valid_video(video_path):
+                self.health.record_success(provider['name'], latency)
+                self._record_attempt(provider['name'], latency, 'success')
+                report('provider', provider=provider['name'], status='success', latency=round(latency, 2))
+                return video_path
+            self.health.record_failure(provider['name'], latency)
+            self._record_attempt(provider['name'], latency, 'failed')
+            report('provider', provider=provider['name'], status='failed', latency=round(latency, 2))
+            return None
+        except Exception as e:
+            latency = time.time() - start_time
+            print(f"❌ {provider['name']} failed: {e}")
+            self.health.record_failure(provider['name'], latency, str(e))
+            self._record_attempt(provider['name'], latency, 'failed')
+            report('provider', provider=provider['name'], status='failed', latency=round(latency, 2), error=str(e))
+            return None
+    
+    @staticmethod
+    def _record_attempt(name, latency, outcome):
+        """Provider-Versuch in Metriken und Request-Timings erfassen"""
+        PROVIDER_SECONDS.observe(latency, provider=name, outcome=outcome)
+        if outcome != 'success':
+            PROVIDER_FAILURES.inc(provider=name)
+        record_timing(f"provider:{name}", latency)
+    
+    def _is_valid_video(self, video_path) -> bool:
+        return bool(video_path) and os.path.exists(video_path) and os.path.getsize(video_path) > 1000
+    
+    @staticmethod
+    def _discard_late_result(future):
+        """Löscht Videos von Providern, die nach dem Gewinner fertig wurden"""
+        try:
+            video_path = future.result()
+            if video_path and os.path.exists(video_path):
+                os.remove(video_path)
+                print(f"🗑️ Discarded late provider result: {os.path.basename(video_path)}")
+        except Exception:
+            pass
+    
+    def _race_providers(self, prompt: str, race_width: int = None, deadline: float = None) -> Optional[str]:
+        """
+        🏁 Startet die ersten N Provider gleichzeitig, rückt bei Fehlschlägen nach
+        und gibt das erste gültige Video zurück (mit Gesamt-Deadline)
+        """
+        race_width = race_width or int(os.getenv('AI_RACE_WIDTH', '3'))
+        deadline = deadline or float(os.getenv('AI_DEADLINE_SECONDS', '180'))
+        end_time = time.time() + deadline
+        
+        chain = self._get_provider_chain(prompt)
+        pending = {}
+        winner = None
+        
+        print(f"🏁 Racing {race_width} providers at once (deadline: {deadline:.0f}s)")
+        
+        def launch():
+            while chain and len(pending) < race_width:
+                provider = chain.pop(0)
+                pending[_provider_pool.submit(propagate(self._run_provider), provider, end_time)] = provider
+        
+        launch()
+        
+        while pending and not winner:
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                print("⏰ Provider deadline reached")
+                break
+            
+            done, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                provider = pending.pop(future)
+                video_path = future.result()
+                
+                if not video_path:
+                    print(f"❌ {provider['name']} failed")
+                elif winner:
+                    self._discard_late_result(future)
+                else:
+                    winner = video_path
+                    print(f"✅ {provider['name']} SUCCESS! ({provider['category']})")
+            
+            if not winner:
+                launch()
+        
+        # Verlierer abbrechen bzw. ihre Ergebnisse verwerfen
+        for future in pending:
+            if not future.cancel():
+                future.add_done_callback(self._discard_late_result)
+        
+        if not winner:
+            print("❌ ALL FREE AI VIDEO SERVICES FAILED")
+        
+        return winner
+    
     def _try_working_hf_spaces(self, prompt: str) -> Optional[str]:
         """🥇 Aktuelle, funktionierende HF Spaces (Juni 2025)"""
         try:
@@ -60,38 +285,9 @@ class FreeAIVideoGenerator:
                 subprocess.check_call(["pip", "install", "gradio-client"])
                 from gradio_client import Client
             
-            # AKTUELLE SPACES DIE FUNKTIONIEREN (Stand Juni 2025)
-            working_spaces = [
-                {
-                    "name": "Zeroscope v2 XL",
-                    "space_id": "fffiloni/zeroscope-v2-xl",
-                    "method": "zeroscope"
-                },
-                {
-                    "name": "AnimateDiff Lightning",
-                    "space_id": "ByteDance/AnimateDiff-Lightning",
-                    "method": "animatediff"
-                },
-                {
-                    "name": "I2VGen-XL",
-                    "space_id": "ali-vilab/i2vgen-xl",
-                    "method": "i2vgen"
-                },
-                {
-                    "name": "LaVie",
-                    "space_id": "Vchitect/LaVie",
-                    "method": "lavie"
-                },
-                {
-                    "name": "VideoCrafter",
-                    "space_id": "VideoCrafter/VideoCrafter2",
-                    "method": "videocrafter"
-                }
-            ]
-            
             enhanced_prompt = f"{prompt}, high quality, cinematic, smooth motion"
             
-            for space in working_spaces:
+            for space in self.WORKING_HF_SPACES:
                 try:
                     print(f"🚀 Trying {space['name']}...")
                     
@@ -111,60 +307,14 @@ class FreeAIVideoGenerator:
         except Exception as e:
             print(f"❌ HF Spaces error: {str(e)}")
             return None    
-    def _call_hf_space(self, space, prompt):
-        """Ruft HF Space mit spezifischer Methode auf"""
+    def _call_hf_space(self, space, prompt, timeout: float = None):
+        """Ruft HF Space mit spezifischer Methode auf (höchstens timeout Sekunden)"""
         try:
-            from gradio_client import Client
-            
             space_url = f"https://huggingface.co/spaces/{space['space_id']}"
-            client = Client(space_url)
-            
-            # Verschiedene Aufruf-Methoden je nach Space
-            if space['method'] == 'zeroscope':
-                result = client.predict(
-                    prompt,  # prompt
-                    1024,    # width
-                    576,     # height
-                    24,      # num_frames
-                    api_name="/predict"
-                )
-            
-            elif space['method'] == 'animatediff':
-                result = client.predict(
-                    prompt,  # prompt
-                    "",      # negative_prompt
-                    1024,    # width
-                    576,     # height
-                    16,      # num_frames
-                    api_name="/generate"
-                )
             
-            elif space['method'] == 'i2vgen':
-                # Für I2VGen brauchen wir erst ein Bild
-                result = client.predict(
-                    prompt,  # text_prompt
-                    api_name="/text_to_video"
-                )
-            
-            elif space['method'] == 'lavie':
-                result = client.predict(
-                    prompt,  # prompt
-                    16,      # num_frames
-                    320,     # height
-                    512,     # width
-                    api_name="/predict"
-                )
-            
-            elif space['method'] == 'videocrafter':
-                result = client.predict(
-                    prompt,  # prompt
-                    "",      # negative_prompt
-                    api_name="/generate_video"
-                )
-            
-            else:
-                # Standard Aufruf
-                result = client.predict(prompt, api_name="/predict")
+            # Vorgewärmter Client aus dem Pool (spart Config/Schema-Handshake)
+            with self.gradio_pool.checkout(space['space_id'], space_url) as client:
+                result = self._predict_hf_space(client, space, prompt, timeout)
             
             # Extrahiere Video-Pfad
             return self._extract_video_from_result(result, space['name'])
@@ -173,6 +323,44 @@ class FreeAIVideoGenerator:
             print(f"❌ Space call failed: {e}")
             return None
     
+    def _predict_hf_space(self, client, space, prompt, timeout: float = None):
+        """
+        Ruft den Space mit seiner Signatur per submit() auf und wartet höchstens
+        timeout Sekunden. Danach wird der Gradio-Job abgebrochen, damit ein hängender
+        Space keinen Worker des Provider-Pools dauerhaft blockiert.
+        """
+        # Verschiedene Aufruf-Signaturen je nach Space
+        if space['method'] == 'zeroscope':
+            # prompt, width, height, num_frames
+            args, api_name = (prompt, 1024, 576, 24), "/predict"
+        
+        elif space['method'] == 'animatediff':
+            # prompt, negative_prompt, width, height, num_frames
+            args, api_name = (prompt, "", 1024, 576, 16), "/generate"
+        
+        elif space['method'] == 'i2vgen':
+            # Für I2VGen brauchen wir erst ein Bild - text_prompt
+            args, api_name = (prompt,), "/text_to_video"
+        
+        elif space['method'] == 'lavie':
+            # prompt, num_frames, height, width
+            args, api_name = (prompt, 16, 320, 512), "/predict"
+        
+        elif space['method'] == 'videocrafter':
+            # prompt, negative_prompt
+            args, api_name = (prompt, ""), "/generate_video"
+        
+        else:
+            # Standard Aufruf
+            args, api_name = (prompt,), "/predict"
+        
+        job = client.submit(*args, api_name=api_name)
+        try:
+            return job.result(timeout=timeout or HF_SPACE_TIMEOUT)
+        except FutureTimeoutError:
+            job.cancel()
+            raise TimeoutError(f"{space['name']} did not answer within {timeout or HF_SPACE_TIMEOUT:.0f}s")
+    
     def _extract_video_from_result(self, result, space_name):
         """Extrahiert Video aus verschiedenen Rückgabe-Formaten"""
         try:
@@ -216,29 +404,39 @@ class FreeAIVideoGenerator:
             return None
     
     def _copy_video_to_output(self, video_path, space_name):
-        """Kopiert Video zu unserem Output-Ordner"""
+        """Übernimmt ein Video in unseren Output-Ordner (verschieben, verlinken oder kopieren)"""
         try:
             if not os.path.exists(video_path):
                 print(f"❌ Video file not found: {video_path}")
                 return None
             
-            # Kopiere zu Output-Ordner
-            import shutil
-            safe_name = space_name.lower().replace(' ', '_').replace('-', '_')
-            final_filename = f"hf_{safe_name}_{int(time.time())}.mp4"
-            final_path = os.path.join(self.output_dir, final_filename)
-            
-            shutil.copy2(video_path, final_path)
-            
             # Prüfe Dateigröße
-            file_size = os.path.getsize(final_path)
-            if file_size > 1000:  # Mindestens 1KB
-                print(f"✅ Video copied: {final_path} ({file_size/1024/1024:.2f} MB)")
-                return final_path
-            else:
+            file_size = os.path.getsize(video_path)
+            if file_size <= 1000:  # Mindestens 1KB
                 print(f"❌ Video file too small: {file_size} bytes")
-                os.remove(final_path)
                 return None
+            
+            safe_name = space_name.lower().replace(' ', '_').replace('-', '_')
+            final_path = new_artifact_path(self.output_dir, f"hf_{safe_name}", 'mp4')
+            
+            # Gradio-Temp-Datei übernehmen statt kopieren: Umbenennen auf derselben
+            # Partition, sonst Hardlink; nur über Dateisystemgrenzen wird kopiert
+            try:
+                os.replace(video_path, final_path)
+                action = 'moved'
+            except OSError:
+                try:
+                    os.link(video_path, final_path)
+                    action = 'linked'
+                except OSError:
+                    import shutil
+                    with atomic_output(final_path) as tmp_path:
+                        shutil.copy2(video_path, tmp_path)
+                    action = 'copied'
+            get_storage_manager().register(final_path)
+            
+            print(f"✅ Video {action}: {final_path} ({file_size/1024/1024:.2f} MB)")
+            return final_path
                 
         except Exception as e:
             print(f"❌ Video copy failed: {e}")
@@ -249,21 +447,7 @@ class FreeAIVideoGenerator:
         try:
             print("🔄 Trying public AI APIs...")
             
-            # Liste öffentlicher APIs
-            public_apis = [
-                {
-                    "name": "Pollinations AI",
-                    "url": "https://image.pollinations.ai/prompt/{prompt}?model=flux&width=1024&height=576&enhance=true&nologo=true",
-                    "type": "image_to_video"
-                },
-                {
-                    "name": "Dezgo AI",
-                    "url": "https://api.dezgo.com/text2video",
-                    "type": "text_to_video"
-                }
-            ]
-            
-            for api in public_apis:
+            for api in self.PUBLIC_AI_APIS:
                 try:
                     print(f"🚀 Trying {api['name']}...")
                     
@@ -288,7 +472,7 @@ class FreeAIVideoGenerator:
     def _call_text_to_video_api(self, api, prompt):
         """Ruft Text-to-Video API auf"""
         try:
-            response = requests.post(
+            response = self.http.post(
                 api['url'],
                 json={
                     "prompt": prompt,
@@ -334,7 +518,7 @@ class FreeAIVideoGenerator:
             print("🎬 Creating video from image...")
             
             # Lade Bild
-            response = requests.get(image_url, timeout=30)
+            response = self.http.get(image_url, timeout=30)
             if response.status_code != 200:
                 return None
             
@@ -344,50 +528,19 @@ class FreeAIVideoGenerator:
                 temp_img.write(response.content)
                 temp_img_path = temp_img.name
             
-            # Erstelle Video mit MoviePy
-            import moviepy.editor as mp
-            from PIL import Image
-            
-            # Lade Bild
-            img = Image.open(temp_img_path)
-            img = img.resize((1024, 576))
-            
-            # Erstelle 4-Sekunden Video mit leichter Animation
-            def make_frame(t):
-                # Leichte Zoom-Animation
-                zoom = 1.0 + 0.1 * (t / 4.0)
-                new_size = (int(1024 * zoom), int(576 * zoom))
-                zoomed_img = img.resize(new_size)
-                
-                # Zentriere das gezoomte Bild
-                if zoom > 1.0:
-                    left = (new_size[0] - 1024) // 2
-                    top = (new_size[1] - 576) // 2
-                    cropped_img = zoomed_img.crop((left, top, left + 1024, top + 576))
-                else:
-                    cropped_img = zoomed_img
-                
-                return np.array(cropped_img)
-            
-            # Erstelle Video-Clip
-            video_clip = mp.VideoClip(make_frame, duration=4.0)
+            # Speichere Video
+            output_path = new_artifact_path(self.output_dir, 'image_to_video', 'mp4')
             
-                        # Speichere Video
-            output_filename = f"image_to_video_{int(time.time())}.mp4"
-            output_path = os.path.join(self.output_dir, output_filename)
-            
-            video_clip.write_videofile(
-                output_path,
-                fps=24,
-                codec='libx264',
-                verbose=False,
-                logger=None
-            )
+            # 4-Sekunden Zoom-Animation im Render-Prozess (CPU-lastig)
+            output_path = get_render_pool().run(render_image_video, temp_img_path, output_path,
+                                                (1024, 576), 4.0, 24)
             
             # Cleanup
-            video_clip.close()
             os.unlink(temp_img_path)
             
+            if not output_path:
+                return None
+            
             print(f"✅ Video from image created: {output_path}")
             return output_path
             
@@ -396,39 +549,55 @@ class FreeAIVideoGenerator:
             return None
     
     def _download_video_from_url(self, video_url, service_name):
-        """Lädt Video von URL herunter"""
+        """
+        Lädt Video von URL herunter: große Chunks, SHA-256 wird beim Schreiben
+        berechnet (Inhalts-Hash als Dateiname und ETag, kein erneutes Lesen).
+        Die Datei wird genau einmal geschrieben und danach nur noch umbenannt.
+        """
         try:
             print(f"⬇️ Downloading video from {service_name}...")
             
-            response = requests.get(video_url, timeout=300, stream=True)
-            response.raise_for_status()
-            
-            # Erstelle Dateinamen
-            safe_name = service_name.lower().replace(' ', '_')
-            output_filename = f"{safe_name}_video_{int(time.time())}.mp4"
-            output_path = os.path.join(self.output_dir, output_filename)
-            
-            # Download mit Progress
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
+            # Response schließen gibt den Host-Slot der HTTP-Schicht wieder frei
+            with self.http.get(video_url, timeout=300, stream=True) as response:
+                response.raise_for_status()
             
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            print(f"📥 Download: {progress:.1f}%", end='\r')
+                # Download mit Progress (nur bei Prozentwechsel melden)
+                total_size = int(response.headers.get('content-length', 0))
+                downloaded = 0
+                last_percent = -1
+                sha = hashlib.sha256()
             
-            print(f"\n✅ Video downloaded: {output_path}")
-            
-            # Prüfe Dateigröße
-            file_size = os.path.getsize(output_path)
-            if file_size < 1000:
-                print(f"❌ Downloaded file too small: {file_size} bytes")
-                os.remove(output_path)
-                return None
+                # Temp-Datei im Output-Ordner, damit das Umbenennen atomar bleibt
+                tmp_path = new_artifact_path(self.output_dir, '.download', 'tmp.mp4')
+                try:
+                    with time_stage('download'):
+                        with open(tmp_path, 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                                if chunk:
+                                    f.write(chunk)
+                                    sha.update(chunk)
+                                    downloaded += len(chunk)
+                                    if total_size > 0:
+                                        percent = int(downloaded * 100 / total_size)
+                                        if percent != last_percent:
+                                            last_percent = percent
+                                            report('download', service=service_name, percent=percent)
+                
+                    # Prüfe Dateigröße
+                    if downloaded < 1000:
+                        raise ValueError(f"Downloaded file too small: {downloaded} bytes")
+                
+                    # Inhaltsadressierter Name: identische Videos landen in derselben Datei
+                    digest = sha.hexdigest()
+                    safe_name = service_name.lower().replace(' ', '_')
+                    output_path = new_artifact_path(self.output_dir, f"{safe_name}_video", 'mp4', key=digest[:32])
+                    os.replace(tmp_path, output_path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+            
+            get_storage_manager().register(output_path, sha256=digest)
+            print(f"✅ Video downloaded: {output_path} ({downloaded / 1024 / 1024:.2f} MB)")
             
             return output_path
             
@@ -441,26 +610,7 @@ class FreeAIVideoGenerator:
         try:
             print("🔄 Trying community AI services...")
             
-            # Community Services
-            community_services = [
-                {
-                    "name": "DeepAI Text2Video",
-                    "url": "https://api.deepai.org/api/text2vid",
-                    "method": "deepai"
-                },
-                {
-                    "name": "AI Video Generator",
-                    "url": "https://api.aiforthat.com/v1/text-to-video",
-                    "method": "aiforthat"
-                },
-                {
-                    "name": "Free Video AI",
-                    "url": "https://freevideoai.com/api/generate",
-                    "method": "freevideoai"
-                }
-            ]
-            
-            for service in community_services:
+            for service in self.COMMUNITY_SERVICES:
                 try:
                     print(f"🚀 Trying {service['name']}...")
                     
@@ -483,7 +633,7 @@ class FreeAIVideoGenerator:
         """Ruft Community Service auf"""
         try:
             if service['method'] == 'deepai':
-                response = requests.post(
+                response = self.http.post(
                     service['url'],
                     data={
                         'text': prompt,
@@ -498,7 +648,7 @@ class FreeAIVideoGenerator:
                         return self._download_video_from_url(result['output_url'], service['name'])
             
             elif service['method'] == 'aiforthat':
-                response = requests.post(
+                response = self.http.post(
                     service['url'],
                     json={
                         'prompt': prompt,
@@ -514,7 +664,7 @@ class FreeAIVideoGenerator:
                         return self._download_video_from_url(result['video_url'], service['name'])
             
             elif service['method'] == 'freevideoai':
-                response = requests.post(
+                response = self.http.post(
                     service['url'],
                     json={
                         'text_prompt': prompt,
@@ -613,42 +763,44 @@ class FreeAIVideoGenerator:
         return results
     
     def get_service_status(self):
-        """📊 Zeige Status aller Services"""
-        return {
-            'working_hf_spaces': {
-                'available': True,
-                'cost': 'Free',
-                'description': 'Current working HuggingFace Spaces via Gradio Client',
-                'services': ['Zeroscope v2 XL', 'AnimateDiff Lightning', 'I2VGen-XL', 'LaVie', 'VideoCrafter']
-            },
-            'public_ai_apis': {
-                'available': True,
-                'cost': 'Free',
-                'description': 'Public AI APIs for video generation',
-                'services': ['Pollinations AI', 'Dezgo AI']
-            },
-            'community_services': {
-                'available': True,
+        """📊 Zeige Status aller Services (mit echten Health-Daten)"""
+        categories = {
+            'working_hf_spaces': (self.WORKING_HF_SPACES, 'Current working HuggingFace Spaces via Gradio Client'),
+            'public_ai_apis': (self.PUBLIC_AI_APIS, 'Public AI APIs for video generation'),
+            'community_services': (self.COMMUNITY_SERVICES, 'Community-driven AI video services')
+        }
+        
+        status = {}
+        for category, (providers, description) in categories.items():
+            health = {provider['name']: self.health.get_provider_stats(provider['name']) for provider in providers}
+            status[category] = {
+                'available': any(stats['available'] for stats in health.values()),
                 'cost': 'Free',
-                'description': 'Community-driven AI video services',
-                'services': ['DeepAI Text2Video', 'AI Video Generator', 'Free Video AI']
+                'description': description,
+                'services': [provider['name'] for provider in providers],
+                'health': health
             }
-        }
+        return status
     
     def get_status(self):
         """Get generator status"""
+        providers = self.WORKING_HF_SPACES + self.PUBLIC_AI_APIS + self.COMMUNITY_SERVICES
+        available = [provider['name'] for provider in providers if self.health.is_available(provider['name'])]
         return {
-            'services_available': 10,  # 5 HF Spaces + 2 Public APIs + 3 Community
+            'services_available': len(available),
+            'services_total': len(providers),
+            'circuit_open': [provider['name'] for provider in providers if provider['name'] not in available],
             'all_free': True,
             'no_local_fallback': True,
             'no_billing_required': True,
             'output_dir': self.output_dir,
-            'ready_for_generation': True
+            'ready_for_generation': len(available) > 0,
+            'gradio_clients': self.gradio_pool.get_stats()
         }
     
     def get_working_spaces_list(self):
         """Liste der aktuell funktionierenden Spaces"""
-        return [
+        spaces = [
             {
                 "name": "Zeroscope v2 XL",
                 "url": "https://huggingface.co/spaces/fffiloni/zeroscope-v2-xl",
@@ -680,6 +832,11 @@ class FreeAIVideoGenerator:
                 "status": "active"
             }
         ]
+        
+        for space in spaces:
+            if not self.health.is_available(space['name']):
+                space['status'] = 'circuit_open'
+        return spaces
     
     def create_ai_video(self, audio_file, prompt):
         """Alias für Kompatibilität mit anderen Generatoren"""
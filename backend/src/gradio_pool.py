@@ -0,0 +1,93 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+
+class GradioClientPool:
+    """
+    Cache für vorgewärmte gradio_client.Client-Instanzen pro Space.
+    Jede Client-Erzeugung lädt Config und API-Schema des Space über das Netz,
+    deshalb werden Clients nach erfolgreichen Aufrufen wiederverwendet.
+    """
+
+    def __init__(self, ttl: float = None, max_idle_per_space: int = 2):
+        self.ttl = ttl or float(os.getenv('GRADIO_CLIENT_TTL', '1800'))
+        self.max_idle_per_space = max_idle_per_space
+        self._lock = threading.Lock()
+        self._idle = {}  # space_id -> [(client, created_at)]
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _create_client(self, space_url: str):
+        from gradio_client import Client
+        return Client(space_url)
+
+    def _acquire(self, space_id: str, space_url: str):
+        with self._lock:
+            idle = self._idle.get(space_id, [])
+            while idle:
+                client, created_at = idle.pop()
+                if time.time() - created_at < self.ttl:
+                    self.reused += 1
+                    return client, created_at
+                # Abgelaufen - Space könnte neu deployed worden sein
+                self.evicted += 1
+
+        # Erzeugung außerhalb des Locks (Netzwerk-Handshake)
+        client = self._create_client(space_url)
+        with self._lock:
+            self.created += 1
+        return client, time.time()
+
+    def _release(self, space_id: str, client, created_at: float):
+        with self._lock:
+            idle = self._idle.setdefault(space_id, [])
+            if len(idle) < self.max_idle_per_space:
+                idle.append((client, created_at))
+            else:
+                self.evicted += 1
+
+    @contextmanager
+    def checkout(self, space_id: str, space_url: str):
+        """
+        Leiht einen Client aus. Bei einer Exception wird der Client verworfen,
+        sonst kommt er zurück in den Pool.
+        """
+        client, created_at = self._acquire(space_id, space_url)
+        try:
+            yield client
+        except Exception:
+            with self._lock:
+                self.evicted += 1
+            print(f"♻️ Evicting Gradio client for {space_id}")
+            raise
+        self._release(space_id, client, created_at)
+
+    def evict(self, space_id: str):
+        """Verwirft alle Clients eines Space"""
+        with self._lock:
+            self.evicted += len(self._idle.pop(space_id, []))
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'idle_clients': sum(len(idle) for idle in self._idle.values()),
+                'spaces': len(self._idle),
+                'created': self.created,
+                'reused': self.reused,
+                'evicted': self.evicted
+            }
+
+
+_gradio_pool = None
+_gradio_pool_lock = threading.Lock()
+
+def get_gradio_pool() -> GradioClientPool:
+    """Gemeinsamer Client-Pool für alle FreeAIVideoGenerator-Instanzen"""
+    global _gradio_pool
+    with _gradio_pool_lock:
+        if _gradio_pool is None:
+            _gradio_pool = GradioClientPool()
+        return _gradio_pool
@@ -0,0 +1,147 @@
+import os
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpTransport:
+    """
+    Gemeinsame HTTP-Schicht für alle ausgehenden Provider- und Download-Aufrufe:
+    - Keep-Alive-Sessions pro Host (Connection-Pooling)
+    - Retries mit Jitter-Backoff bei Verbindungsfehlern und 429/5xx
+    - getrennte Connect- und Read-Timeouts
+    - begrenzte gleichzeitige Requests pro Host
+    """
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    # Nur diese Methoden dürfen nach einem Read-Timeout erneut gesendet werden
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+    def __init__(self, max_retries: int = None, backoff_base: float = None, connect_timeout: float = None,
+                 read_timeout: float = None, max_per_host: int = None, pool_size: int = 10):
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('HTTP_MAX_RETRIES', '2'))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv('HTTP_BACKOFF_BASE', '0.5'))
+        self.connect_timeout = connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT', '10'))
+        self.read_timeout = read_timeout or float(os.getenv('HTTP_READ_TIMEOUT', '120'))
+        self.max_per_host = max_per_host or int(os.getenv('HTTP_MAX_PER_HOST', '4'))
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._semaphores = {}
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _get_host_state(self, url: str):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = self._create_session()
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._sessions[host], self._semaphores[host]
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponentielles Backoff mit vollem Jitter"""
+        return random.uniform(0, self.backoff_base * (2 ** attempt))
+
+    def request(self, method: str, url: str, timeout=None, retries: int = None, **kwargs) -> requests.Response:
+        """
+        Wie requests.request, aber mit gepoolter Session und Retries.
+        timeout ist entweder der Read-Timeout oder ein (connect, read)-Tupel.
+        Nicht-idempotente Requests (POST) werden nur bei Verbindungsfehlern wiederholt,
+        nie nach einem Read-Timeout (der Provider könnte den Job schon angenommen haben).
+        Bei stream=True bleibt der Host-Slot belegt, bis die Response geschlossen wird.
+        """
+        if isinstance(timeout, (tuple, list)):
+            timeout = tuple(timeout)
+        else:
+            timeout = (self.connect_timeout, timeout or self.read_timeout)
+        retries = self.max_retries if retries is None else retries
+
+        retryable = (requests.ConnectionError, requests.Timeout) \
+            if method.upper() in self.IDEMPOTENT_METHODS else requests.ConnectionError
+
+        session, semaphore = self._get_host_state(url)
+        attempt = 0
+        while True:
+            try:
+                response = self._send(session, semaphore, method, url, timeout, kwargs)
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt >= retries:
+                    return response
+                print(f"🔁 HTTP {response.status_code} from {urlsplit(url).netloc}, retrying ({attempt + 1}/{retries})...")
+                response.close()
+            except retryable as e:
+                if attempt >= retries:
+                    raise
+                print(f"🔁 HTTP error from {urlsplit(url).netloc}: {e}, retrying ({attempt + 1}/{retries})...")
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    @staticmethod
+    def _send(session, semaphore, method, url, timeout, kwargs) -> requests.Response:
+        """Sendet einen Request innerhalb des Host-Limits"""
+        if not kwargs.get('stream'):
+            with semaphore:
+                return session.request(method, url, timeout=timeout, **kwargs)
+
+        # Streaming: der Body wird erst später gelesen, Slot erst beim Schließen freigeben
+        semaphore.acquire()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        close = response.close
+        released = threading.Event()
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    semaphore.release()
+
+        response.close = close_and_release
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._semaphores.clear()
+
+
+_http_transport = None
+_http_transport_lock = threading.Lock()
+
+def get_http_transport() -> HttpTransport:
+    """Gemeinsame HTTP-Schicht (für Tests per set_http_transport austauschbar)"""
+    global _http_transport
+    with _http_transport_lock:
+        if _http_transport is None:
+            _http_transport = HttpTransport()
+        return _http_transport
+
+def set_http_transport(transport: HttpTransport):
+    """Ersetzt die gemeinsame HTTP-Schicht, z.B. durch einen lokalen Stub"""
+    global _http_transport
+    with _http_transport_lock:
+        _http_transport = transport
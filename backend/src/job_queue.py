@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from progress import set_reporter, reset_reporter
+
+
+class Job:
+    """Ein einzelner Generierungs-Job mit Status, Stage und Ergebnis"""
+
+    def __init__(self, kind: str, params: dict = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.status = 'queued'   # queued -> running -> finished | failed
+        self.stage = 'queued'
+        self.progress = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.RLock()
+        self._events_changed = threading.Condition(self._lock)
+        self._events = []
+        self._done = threading.Event()
+
+    def update(self, stage: str = None, progress: float = None):
+        """Aktualisiert Stage und Fortschritt (0-100)"""
+        with self._lock:
+            if stage is not None:
+                self.stage = stage
+            if progress is not None:
+                self.progress = max(0, min(100, int(progress)))
+            self.emit('stage', {'stage': self.stage, 'progress': self.progress})
+
+    def emit(self, event_type: str, data: dict = None):
+        """Hängt ein strukturiertes Fortschritts-Event an (für SSE-Clients)"""
+        with self._events_changed:
+            self._events.append({
+                'id': len(self._events),
+                'type': event_type,
+                'time': time.time(),
+                'data': data or {}
+            })
+            self._events_changed.notify_all()
+
+    def wait_events(self, start: int, timeout: float = None):
+        """
+        Wartet auf Events ab Index start.
+        Gibt (neue Events, Job fertig) zurück.
+        """
+        with self._events_changed:
+            if len(self._events) <= start and not self._done.is_set():
+                self._events_changed.wait(timeout)
+            return self._events[start:], self._done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Blockiert bis der Job fertig ist"""
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def _start(self):
+        with self._lock:
+            self.status = 'running'
+            self.stage = 'starting'
+            self.started_at = time.time()
+
+    def _finish(self, result=None, error=None):
+        with self._lock:
+            self.finished_at = time.time()
+            if error is None:
+                self.status = 'finished'
+                self.stage = 'done'
+                self.progress = 100
+                self.result = result
+            else:
+                self.status = 'failed'
+                self.error = error
+            self._done.set()
+            self.emit(self.status, {'result': self.result, 'error': self.error})
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'stage': self.stage,
+                'progress': self.progress,
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+
+
+class JobQueue:
+    """
+    Begrenzter Worker-Pool für lange Generierungs-Pipelines.
+    POST-Routen reichen Jobs ein und antworten sofort mit der Job-ID,
+    der Status wird über GET /api/jobs/<id> abgefragt.
+    """
+
+    def __init__(self, max_workers: int = None, max_finished_jobs: int = 500):
+        self.max_workers = max_workers or int(os.getenv('JOB_WORKERS', '0')) or os.cpu_count() or 2
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job-worker')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        print(f"🧵 Job queue initialized ({self.max_workers} workers)")
+
+    def submit(self, kind: str, func, *args, params: dict = None, **kwargs) -> Job:
+        """
+        Reicht einen Job ein. func wird als func(job, *args, **kwargs) im
+        Worker-Pool ausgeführt, der Rückgabewert wird zum Job-Ergebnis.
+        """
+        job = Job(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func, args, kwargs)
+        print(f"📨 Job queued: {job.id} ({kind})")
+        return job
+
+    def _run(self, job: Job, func, args, kwargs):
+        job._start()
+        # Fortschritts-Events aus der Pipeline landen im Event-Log des Jobs
+        token = set_reporter(job.emit)
+        try:
+            result = func(job, *args, **kwargs)
+            job._finish(result=result)
+            print(f"✅ Job finished: {job.id}")
+        except Exception as e:
+            print(f"❌ Job failed: {job.id}: {e}")
+            job._finish(error=str(e))
+        finally:
+            reset_reporter(token)
+
+    def _prune(self):
+        """Entfernt die ältesten abgeschlossenen Jobs über dem Limit"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            'max_workers': self.max_workers,
+            'queued': sum(1 for job in jobs if job.status == 'queued'),
+            'running': sum(1 for job in jobs if job.status == 'running'),
+            'finished': sum(1 for job in jobs if job.status == 'finished'),
+            'failed': sum(1 for job in jobs if job.status == 'failed')
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
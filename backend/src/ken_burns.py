@@ -0,0 +1,94 @@
+import numpy as np
+
+try:
+    import cv2
+except ImportError:  # OpenCV ist optional, NumPy-Fallback unten
+    cv2 = None
+
+
+class KenBurnsRenderer:
+    """
+    Pan/Zoom-Animation (Ken-Burns-Effekt) für Standbilder.
+    Alle Affin-Transformationen werden vorab berechnet; pro Frame erfolgt
+    Crop + Skalierung in einem einzigen warpAffine-Schritt in einen
+    vorab allokierten Ausgabepuffer.
+    """
+
+    def __init__(self, image, size=(1024, 576), duration: float = 4.0, fps: int = 24,
+                 zoom_start: float = 1.0, zoom_end: float = 1.1, pan=(0.0, 0.0)):
+        """
+        image: PIL-Bild oder NumPy-Array (H, W, 3)
+        size: Ausgabegröße (Breite, Höhe)
+        pan: Verschiebung am Ende der Animation in Pixeln (x, y)
+        """
+        self.width, self.height = size
+        self.duration = duration
+        self.fps = fps
+        self.frame_count = max(1, int(round(duration * fps)))
+
+        # Quelle einmalig auf Ausgabegröße bringen
+        if not isinstance(image, np.ndarray):
+            image = np.asarray(image.convert('RGB').resize(size))
+        elif image.shape[1] != self.width or image.shape[0] != self.height:
+            if cv2 is not None:
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+            else:
+                from PIL import Image
+                image = np.asarray(Image.fromarray(image).resize(size))
+        self.source = np.ascontiguousarray(image[:, :, :3], dtype=np.uint8)
+
+        self._buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._matrices = self._precompute_matrices(zoom_start, zoom_end, pan)
+        if cv2 is None:
+            self._row_buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            self._indices = self._precompute_indices()
+
+    def _precompute_matrices(self, zoom_start, zoom_end, pan):
+        """Affine Matrizen (Quelle -> Ausgabe) für jeden Frame"""
+        cx, cy = self.width / 2.0, self.height / 2.0
+        matrices = []
+        for index in range(self.frame_count):
+            progress = index / max(1, self.frame_count - 1) if self.frame_count > 1 else 0.0
+            zoom = zoom_start + (zoom_end - zoom_start) * progress
+            offset_x = pan[0] * progress
+            offset_y = pan[1] * progress
+            # Zentrierter Zoom: dst = zoom * (src - c) + c - pan
+            matrices.append(np.array([
+                [zoom, 0.0, cx - zoom * cx - offset_x],
+                [0.0, zoom, cy - zoom * cy - offset_y]
+            ], dtype=np.float32))
+        return matrices
+
+    def _precompute_indices(self):
+        """Quell-Indizes für den NumPy-Fallback (Nearest Neighbor)"""
+        xs = np.arange(self.width, dtype=np.float32)
+        ys = np.arange(self.height, dtype=np.float32)
+        indices = []
+        for matrix in self._matrices:
+            zoom = matrix[0, 0]
+            cols = np.clip(np.round((xs - matrix[0, 2]) / zoom), 0, self.width - 1).astype(np.intp)
+            rows = np.clip(np.round((ys - matrix[1, 2]) / zoom), 0, self.height - 1).astype(np.intp)
+            indices.append((rows, cols))
+        return indices
+
+    def frame_index(self, t: float) -> int:
+        return min(self.frame_count - 1, max(0, int(t * self.fps)))
+
+    def render_frame(self, index: int) -> np.ndarray:
+        """Rendert Frame index in den (wiederverwendeten) Ausgabepuffer"""
+        if cv2 is not None:
+            cv2.warpAffine(self.source, self._matrices[index], (self.width, self.height),
+                           dst=self._buffer, flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
+        else:
+            rows, cols = self._indices[index]
+            np.take(self.source, rows, axis=0, out=self._row_buffer)
+            np.take(self._row_buffer, cols, axis=1, out=self._buffer)
+        return self._buffer
+
+    def make_frame(self, t: float) -> np.ndarray:
+        """Kompatibel mit moviepy.VideoClip(make_frame)"""
+        return self.render_frame(self.frame_index(t))
+
+    def iter_frames(self):
+        for index in range(self.frame_count):
+            yield self.render_frame(index)
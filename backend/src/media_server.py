@@ -0,0 +1,93 @@
+import os
+import hashlib
+import mimetypes
+import threading
+
+from flask import Response, request, send_file
+from werkzeug.security import safe_join
+from storage_manager import MEDIA_EXTENSIONS
+
+
+class MediaServer:
+    """
+    Auslieferung generierter Dateien mit:
+    - HTTP Range / 206 Partial Content (Seeking im <video>-Element)
+    - starken ETags aus dem Inhalts-Hash und 304 bei If-None-Match
+    - optionaler Übergabe an nginx (X-Accel-Redirect) oder Apache/lighttpd (X-Sendfile)
+    """
+
+    def __init__(self, root_dir: str, accel: str = None, accel_prefix: str = None, hash_lookup=None):
+        self.root_dir = root_dir
+        # '' (Flask liefert aus), 'nginx' (X-Accel-Redirect) oder 'sendfile' (X-Sendfile)
+        self.accel = (accel if accel is not None else os.getenv('MEDIA_ACCEL', '')).lower()
+        self.accel_prefix = accel_prefix or os.getenv('MEDIA_ACCEL_PREFIX', '/protected-output/')
+        self._lock = threading.Lock()
+        self._etags = {}  # path -> (mtime_ns, size, etag)
+        # Optional: hash_lookup(filename, size) liefert einen bereits bekannten SHA-256
+        self.hash_lookup = hash_lookup
+
+    def get_etag(self, path: str, stat_result) -> str:
+        """SHA-256 des Inhalts, gecacht solange sich mtime und Größe nicht ändern"""
+        with self._lock:
+            cached = self._etags.get(path)
+        if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+            return cached[2]
+
+        etag = self.hash_lookup(os.path.basename(path), stat_result.st_size) if self.hash_lookup else None
+        if not etag:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(chunk)
+            etag = sha.hexdigest()
+
+        with self._lock:
+            self._etags[path] = (stat_result.st_mtime_ns, stat_result.st_size, etag)
+        return etag
+
+    def set_etag(self, path: str, etag: str):
+        """Registriert einen bereits bekannten Inhalts-Hash (spart das erneute Hashen)"""
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._etags[path] = (stat_result.st_mtime_ns, stat_result.st_size, etag)
+
+    def serve(self, filename: str):
+        """Gibt eine Flask-Response zurück oder None, wenn die Datei nicht existiert"""
+        # Nur fertige Medien: keine internen Indizes (.storage_index.json, ...) oder Temp-Dateien
+        if filename.startswith('.') or '.tmp' in filename or not filename.lower().endswith(MEDIA_EXTENSIONS):
+            return None
+        path = safe_join(self.root_dir, filename)
+        if path is None:
+            return None
+
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+
+        etag = self.get_etag(path, stat_result)
+
+        if self.accel == 'nginx':
+            return self._accel_redirect(filename, path, stat_result, etag)
+
+        # send_file übernimmt Range (206), If-None-Match/If-Modified-Since (304)
+        # und bei USE_X_SENDFILE auch den X-Sendfile-Header
+        return send_file(path, conditional=True, etag=etag, last_modified=stat_result.st_mtime)
+
+    def _accel_redirect(self, filename, path, stat_result, etag):
+        """Überlässt nginx das Ausliefern der Bytes (inkl. Range)"""
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response()
+            response.headers['X-Accel-Redirect'] = f"{self.accel_prefix.rstrip('/')}/{filename}"
+            response.headers['Accept-Ranges'] = 'bytes'
+            response.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            # Content-Length setzt nginx selbst
+            response.headers.pop('Content-Length', None)
+        response.set_etag(etag)
+        response.last_modified = stat_result.st_mtime
+        return response
@@ -0,0 +1,206 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Laufzeiten der Stages des aktuellen Requests/Jobs (stage -> Sekunden), pro Kontext
+_current_timings = contextvars.ContextVar('stage_timings', default=None)
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, values, extra=None) -> str:
+    pairs = list(zip(labelnames, values)) + list(extra or [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    TYPE = 'untyped'
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.TYPE}"]
+        for suffix, labelvalues, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, labelvalues, extra)} "
+                         f"{_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monoton steigender Zähler"""
+
+    TYPE = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            return [('', key, None, value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Momentanwert, gesetzt oder beim Export über eine Funktion gelesen"""
+
+    TYPE = 'gauge'
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._function = None
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, function):
+        """Wert wird erst beim Scrape abgefragt (z. B. Queue-Länge)"""
+        self._function = function
+
+    def _samples(self):
+        if self._function is not None:
+            try:
+                return [('', (), None, self._function())]
+            except Exception as e:
+                print(f"⚠️ Gauge {self.name} failed: {e}")
+                return []
+        with self._lock:
+            return [('', key, None, value) for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Verteilung von Dauern mit festen Buckets (kumulativ wie bei Prometheus)"""
+
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry['counts'][i] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            for key, entry in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, entry['counts']):
+                    samples.append(('_bucket', key, [('le', _format_value(float(bound)))], count))
+                samples.append(('_bucket', key, [('le', '+Inf')], entry['count']))
+                samples.append(('_sum', key, None, round(entry['sum'], 6)))
+                samples.append(('_count', key, None, entry['count']))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus Text-Format (Version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics)
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'video_stage_duration_seconds', 'Duration of pipeline stages (tts, provider, download, combine, encode)',
+    labelnames=('stage',)))
+PROVIDER_SECONDS = REGISTRY.register(Histogram(
+    'video_provider_attempt_duration_seconds', 'Duration of single AI provider attempts',
+    labelnames=('provider', 'outcome')))
+PROVIDER_FAILURES = REGISTRY.register(Counter(
+    'video_provider_failures_total', 'Failed AI provider attempts', labelnames=('provider',)))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'video_cache_requests_total', 'Cache lookups by cache and result (hit, miss, coalesced)',
+    labelnames=('cache', 'result')))
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'video_http_requests_total', 'Handled API requests', labelnames=('endpoint', 'status')))
+JOB_QUEUE_DEPTH = REGISTRY.register(Gauge('video_job_queue_depth', 'Jobs waiting for a worker'))
+JOBS_RUNNING = REGISTRY.register(Gauge('video_jobs_running', 'Jobs currently running'))
+RENDERS_IN_FLIGHT = REGISTRY.register(Gauge('video_renders_in_flight', 'Renders currently in the render pool'))
+
+
+def start_timings():
+    """Startet die Stage-Erfassung für den aktuellen Kontext, gibt (token, timings) zurück"""
+    timings = {}
+    return _current_timings.set(timings), timings
+
+
+def reset_timings(token):
+    _current_timings.reset(token)
+
+
+@contextmanager
+def collect_timings():
+    """Sammelt alle Stage-Dauern innerhalb des Blocks in einem Dict"""
+    token, timings = start_timings()
+    try:
+        yield timings
+    finally:
+        reset_timings(token)
+
+
+def record_timing(name: str, seconds: float):
+    """Addiert eine Dauer zu den Timings des aktuellen Requests (falls aktiv)"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings[name] = round(timings.get(name, 0) + seconds, 3)
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Misst einen Pipeline-Schritt: Histogramm und Timings des aktuellen Requests"""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start_time
+        STAGE_SECONDS.observe(duration, stage=stage)
+        record_timing(stage, duration)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
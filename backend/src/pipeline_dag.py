@@ -0,0 +1,140 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from tts import TextToSpeech, PREVIEW_SECONDS
+from audio_cache import AudioCache
+from storage_manager import get_storage_manager
+from free_ai_video_generator import FreeAIVideoGenerator
+from render_tasks import combine_video_with_audio
+from render_pool import get_render_pool
+from progress import report, propagate
+
+
+_provider_asset_cache = None
+_provider_asset_cache_lock = threading.Lock()
+
+def get_provider_asset_cache() -> AudioCache:
+    """Cache für rohe Provider-Videos (nach Prompt), damit Vorschau und Final sie teilen"""
+    global _provider_asset_cache
+    with _provider_asset_cache_lock:
+        if _provider_asset_cache is None:
+            output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+            max_bytes = int(os.getenv('AI_ASSET_CACHE_MAX_MB', '2000')) * 1024 * 1024
+            _provider_asset_cache = AudioCache(output_dir, max_bytes=max_bytes, prefix='ai_asset_',
+                                               index_filename='.ai_asset_cache_index.json')
+        return _provider_asset_cache
+
+
+class PipelineDAG:
+    """
+    Kleiner DAG-Executor für Generierungs-Pipelines.
+    Stages ohne gegenseitige Abhängigkeit laufen parallel, eine Stage startet,
+    sobald alle ihre Abhängigkeiten fertig sind. Der erste Fehler bricht ab.
+    """
+
+    def __init__(self, name: str = 'pipeline'):
+        self.name = name
+        self.stages = OrderedDict()
+        self.timings = {}
+
+    def add_stage(self, name: str, func, depends_on=()):
+        """
+        func erhält ein Dict {abhängigkeit: ergebnis} und gibt das Stage-Ergebnis zurück.
+        Abhängigkeiten müssen vorher hinzugefügt werden (damit ist der Graph azyklisch).
+        """
+        missing = [dep for dep in depends_on if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Unknown dependencies for stage '{name}': {missing}")
+        self.stages[name] = {'func': func, 'depends_on': tuple(depends_on)}
+        return self
+
+    def _run_stage(self, name, func, inputs):
+        start_time = time.time()
+        try:
+            return func(inputs)
+        finally:
+            self.timings[name] = round(time.time() - start_time, 3)
+
+    def run(self) -> dict:
+        """Führt alle Stages aus und gibt {stage: ergebnis} zurück"""
+        results = {}
+        remaining = OrderedDict(self.stages)
+        futures = {}
+        pool = ThreadPoolExecutor(max_workers=max(1, len(self.stages)), thread_name_prefix=self.name)
+
+        try:
+            while remaining or futures:
+                # Alle Stages starten, deren Abhängigkeiten erfüllt sind
+                for name, stage in list(remaining.items()):
+                    if all(dep in results for dep in stage['depends_on']):
+                        inputs = {dep: results[dep] for dep in stage['depends_on']}
+                        future = pool.submit(propagate(self._run_stage), name, stage['func'], inputs)
+                        futures[future] = name
+                        del remaining[name]
+
+                if not futures:
+                    raise RuntimeError(f"Pipeline '{self.name}' is stuck: {list(remaining)}")
+
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    results[name] = future.result()
+                    report('stage_done', stage=name, duration=self.timings.get(name))
+        finally:
+            # Bei Fehlern nicht auf noch laufende Stages warten
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+
+def build_ai_video_pipeline(audio_text: str, video_prompt: str, combine=None,
+                            encoder_profile: str = None, preview: bool = False) -> PipelineDAG:
+    """
+    TTS und AI-Video laufen parallel und werden erst beim Mux zusammengeführt.
+    Ergebnis-Stages: 'tts' (Audio), 'ai_video' (Roh-Video), 'combine' (finales Video).
+    encoder_profile gilt für den Standard-Combine (nur beim Re-Encode relevant).
+    Mit preview=True werden nur die ersten Sätze vertont (Video wird auf die Audiolänge
+    geschnitten). Provider-Video und TTS-Chunks landen im Cache und werden beim
+    finalen Rendering wiederverwendet.
+    """
+    if combine is None:
+        # Kombinieren ist CPU-lastig (Fallback-Re-Encode) - im Render-Prozess
+        combine = lambda video_file, audio_file: get_render_pool().run(combine_video_with_audio, video_file, audio_file,
+                                                                       encoder_profile)
+
+    def synthesize(inputs):
+        tts = TextToSpeech()
+        if preview:
+            audio_file = tts.generate_preview_speech(audio_text, PREVIEW_SECONDS)
+        else:
+            audio_file = tts.generate_speech(audio_text)
+        if not audio_file:
+            raise RuntimeError('Failed to generate audio')
+        report('tts', status='done', file=os.path.basename(audio_file))
+        return audio_file
+
+    def generate_video(inputs):
+        def produce(tmp_path):
+            video_file = FreeAIVideoGenerator().generate_professional_video(video_prompt)
+            if not video_file:
+                raise RuntimeError('All free AI video services failed')
+            # Nur umbenennen - das Provider-Video wird nicht erneut geschrieben
+            os.replace(video_file, tmp_path)
+            get_storage_manager().forget(video_file)
+        
+        key = AudioCache.make_key(prompt=video_prompt, kind='ai_video')
+        return get_provider_asset_cache().get_or_create(key, produce, ext='mp4')
+
+    def mux(inputs):
+        # Falls Kombination fehlschlägt, verwende nur das Video
+        final_video = combine(inputs['ai_video'], inputs['tts'])
+        return final_video or inputs['ai_video']
+
+    dag = PipelineDAG('ai-video')
+    dag.add_stage('tts', synthesize)
+    dag.add_stage('ai_video', generate_video)
+    dag.add_stage('combine', mux, depends_on=('tts', 'ai_video'))
+    return dag
@@ -0,0 +1,64 @@
+import functools
+import contextvars
+
+# Aktueller Empfänger für Fortschritts-Events (z.B. Job.emit), pro Kontext/Thread
+_current_reporter = contextvars.ContextVar('progress_reporter', default=None)
+
+
+def set_reporter(reporter):
+    """Setzt den Empfänger reporter(event_type, data) und gibt ein Reset-Token zurück"""
+    return _current_reporter.set(reporter)
+
+
+def reset_reporter(token):
+    _current_reporter.reset(token)
+
+
+def get_reporter():
+    """Aktueller Empfänger oder None (z.B. um Events aus Render-Prozessen weiterzuleiten)"""
+    return _current_reporter.get()
+
+
+def report(event_type: str, **data):
+    """Meldet ein strukturiertes Fortschritts-Event an den aktuellen Empfänger (falls vorhanden)"""
+    reporter = _current_reporter.get()
+    if reporter is None:
+        return
+    try:
+        reporter(event_type, data)
+    except Exception as e:
+        print(f"⚠️ Progress reporting failed: {e}")
+
+
+def propagate(func):
+    """Bindet func an eine Kopie des aktuellen Kontexts (für Thread-Pools)"""
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def moviepy_logger(stage: str = 'encode'):
+    """
+    proglog-Logger für MoviePy-Writes, der den Encode-Fortschritt in Prozent meldet.
+    Ohne aktiven Empfänger wird None zurückgegeben (MoviePy bleibt still).
+    """
+    if _current_reporter.get() is None:
+        return None
+
+    from proglog import ProgressBarLogger
+
+    class ProgressEventLogger(ProgressBarLogger):
+        def __init__(self):
+            super().__init__()
+            self._last_percent = {}
+
+        def bars_callback(self, bar, attr, value, old_value=None):
+            if attr != 'index':
+                return
+            total = self.bars[bar].get('total')
+            if not total:
+                return
+            percent = min(100, int(value / total * 100))
+            if percent != self._last_percent.get(bar):
+                self._last_percent[bar] = percent
+                report(stage, bar=bar, percent=percent)
+
+    return ProgressEventLogger()
@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+
+
+class ProviderHealthRegistry:
+    """
+    Persistente Health-Statistiken pro AI-Provider mit Circuit Breaker.
+    Provider, die wiederholt fehlschlagen, werden für eine Cool-down-Zeit
+    übersprungen; die Fallback-Kette wird nach Erfolgsrate und Latenz sortiert.
+    """
+
+    STATE_FILENAME = '.provider_health.json'
+    WINDOW = 50  # Anzahl der letzten Aufrufe für Erfolgsrate und Latenz
+
+    def __init__(self, state_dir: str, failure_threshold: int = None, cooldown: float = None):
+        self.state_path = os.path.join(state_dir, self.STATE_FILENAME)
+        self.failure_threshold = failure_threshold or int(os.getenv('AI_CIRCUIT_FAILURES', '3'))
+        self.cooldown = cooldown or float(os.getenv('AI_CIRCUIT_COOLDOWN', '300'))
+        os.makedirs(state_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._providers = {}
+        self._load()
+
+    def _entry(self, name: str) -> dict:
+        entry = self._providers.get(name)
+        if entry is None:
+            entry = {
+                'successes': 0,
+                'failures': 0,
+                'outcomes': deque(maxlen=self.WINDOW),
+                'latencies': deque(maxlen=self.WINDOW),
+                'consecutive_failures': 0,
+                'circuit_open_until': 0.0,
+                'last_error': None,
+                'last_success': None,
+                'last_failure': None
+            }
+            self._providers[name] = entry
+        return entry
+
+    def record_success(self, name: str, latency: float):
+        with self._lock:
+            entry = self._entry(name)
+            entry['successes'] += 1
+            entry['outcomes'].append(1)
+            entry['latencies'].append(round(latency, 3))
+            entry['consecutive_failures'] = 0
+            entry['circuit_open_until'] = 0.0
+            entry['last_success'] = time.time()
+            self._save()
+
+    def record_failure(self, name: str, latency: float, error: str = None):
+        with self._lock:
+            entry = self._entry(name)
+            entry['failures'] += 1
+            entry['outcomes'].append(0)
+            entry['latencies'].append(round(latency, 3))
+            entry['consecutive_failures'] += 1
+            entry['last_error'] = error or 'no valid video returned'
+            entry['last_failure'] = time.time()
+            if entry['consecutive_failures'] >= self.failure_threshold:
+                entry['circuit_open_until'] = time.time() + self.cooldown
+                print(f"🔌 Circuit opened for {name} ({self.cooldown:.0f}s cool-down)")
+            self._save()
+
+    def is_available(self, name: str) -> bool:
+        """False solange der Circuit Breaker offen ist (danach Half-Open-Versuch)"""
+        with self._lock:
+            entry = self._providers.get(name)
+            return entry is None or entry['circuit_open_until'] <= time.time()
+
+    def order(self, providers, key=lambda provider: provider):
+        """
+        Sortiert Provider nach Erfolgsrate (absteigend) und p50-Latenz (aufsteigend).
+        Unbekannte Provider behalten ihre Position relativ zueinander.
+        """
+        with self._lock:
+            def score(item):
+                index, provider = item
+                entry = self._providers.get(key(provider))
+                if entry is None or not entry['outcomes']:
+                    # Neutral: 50% Erfolg, Latenz unbekannt
+                    return (-0.5, float('inf'), index)
+                return (-self._success_rate(entry), self._percentile(entry, 50), index)
+            return [provider for _, provider in sorted(enumerate(providers), key=score)]
+
+    @staticmethod
+    def _success_rate(entry) -> float:
+        outcomes = entry['outcomes']
+        return sum(outcomes) / len(outcomes) if outcomes else 0.0
+
+    @staticmethod
+    def _percentile(entry, percentile: float) -> float:
+        latencies = sorted(entry['latencies'])
+        if not latencies:
+            return float('inf')
+        index = min(len(latencies) - 1, int(round(percentile / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def get_provider_stats(self, name: str) -> dict:
+        with self._lock:
+            entry = self._providers.get(name)
+            if entry is None:
+                return {'calls': 0, 'available': True, 'circuit_open': False}
+            circuit_open = entry['circuit_open_until'] > time.time()
+            p50 = self._percentile(entry, 50)
+            p95 = self._percentile(entry, 95)
+            return {
+                'calls': entry['successes'] + entry['failures'],
+                'successes': entry['successes'],
+                'failures': entry['failures'],
+                'success_rate': round(self._success_rate(entry) * 100, 1),
+                'p50_latency': None if p50 == float('inf') else p50,
+                'p95_latency': None if p95 == float('inf') else p95,
+                'consecutive_failures': entry['consecutive_failures'],
+                'available': not circuit_open,
+                'circuit_open': circuit_open,
+                'circuit_open_until': entry['circuit_open_until'] if circuit_open else None,
+                'last_error': entry['last_error'],
+                'last_success': entry['last_success'],
+                'last_failure': entry['last_failure']
+            }
+
+    def _load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for name, stored in data.get('providers', {}).items():
+                entry = self._entry(name)
+                entry.update({k: v for k, v in stored.items() if k not in ('outcomes', 'latencies')})
+                entry['outcomes'].extend(stored.get('outcomes', []))
+                entry['latencies'].extend(stored.get('latencies', []))
+        except (OSError, ValueError):
+            pass
+
+    def _save(self):
+        data = {
+            name: dict(entry, outcomes=list(entry['outcomes']), latencies=list(entry['latencies']))
+            for name, entry in self._providers.items()
+        }
+        tmp_path = f"{self.state_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'providers': data}, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"⚠️ Could not save provider health: {e}")
+
+
+_health_registry = None
+_health_registry_lock = threading.Lock()
+
+def get_health_registry() -> ProviderHealthRegistry:
+    """Gemeinsame Health-Registry für alle FreeAIVideoGenerator-Instanzen"""
+    global _health_registry
+    with _health_registry_lock:
+        if _health_registry is None:
+            output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+            _health_registry = ProviderHealthRegistry(output_dir)
+        return _health_registry
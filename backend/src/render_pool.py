@@ -0,0 +1,212 @@
+import os
+import threading
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from storage_manager import get_storage_manager
+from metrics import time_stage
+from progress import get_reporter, set_reporter, reset_reporter
+
+# Metrik-Stage je Render-Task (Rest zählt als 'encode')
+RENDER_STAGES = {'combine_video_with_audio': 'combine'}
+
+# Im Worker: Queue für Fortschritts-Events zurück an den Hauptprozess
+_progress_queue = None
+
+
+def _warm_worker(encoder_threads: int, progress_queue=None):
+    """
+    Initializer der Render-Prozesse: schwere Module einmal vorab importieren
+    und die Thread-Anzahl pro Worker begrenzen (keine Überbelegung der Kerne).
+    """
+    global _progress_queue
+    _progress_queue = progress_queue
+    os.environ['RENDER_THREADS'] = str(encoder_threads)
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[var] = str(encoder_threads)
+
+    try:
+        import numpy  # noqa: F401
+        import PIL.Image  # noqa: F401
+        import moviepy.editor  # noqa: F401
+        import render_tasks  # noqa: F401
+        try:
+            import cv2
+            cv2.setNumThreads(encoder_threads)
+        except ImportError:
+            pass
+    except Exception as e:
+        print(f"⚠️ Render worker warm-up failed: {e}")
+
+
+def _ping():
+    return os.getpid()
+
+
+def _run_task(task_id, func, args, kwargs):
+    """
+    Worker-Seite eines Render-Auftrags: report()/moviepy_logger() senden ihre Events
+    mit der Task-ID über die Queue, der Hauptprozess leitet sie an den Job weiter.
+    """
+    if task_id is None or _progress_queue is None:
+        return func(*args, **kwargs)
+    token = set_reporter(lambda event_type, data: _progress_queue.put((task_id, event_type, data)))
+    try:
+        return func(*args, **kwargs)
+    finally:
+        reset_reporter(token)
+        # Endmarke: alle Events dieses Tasks liegen davor in der Queue
+        _progress_queue.put((task_id, None, None))
+
+
+def _get_mp_context():
+    """
+    Kein fork: der Hauptprozess hat bereits Threads (Flask, Job-Worker, Storage-Sweeper),
+    ein geforkter Worker könnte deren gehaltene Locks erben. forkserver wo verfügbar,
+    sonst spawn (Windows). Überschreibbar per RENDER_START_METHOD.
+    """
+    method = os.getenv('RENDER_START_METHOD')
+    if not method:
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+class RenderPool:
+    """
+    Pool vorgestarteter Render-Prozesse mit bereits importiertem MoviePy/NumPy/PIL.
+    CPU-lastige Encodes (Slides, Kombinieren, Bild-zu-Video) laufen hier statt im
+    Flask-Thread, jeder Worker nutzt nur RENDER_THREADS Encoder-Threads.
+    """
+
+    def __init__(self, workers: int = None, encoder_threads: int = None):
+        cpu_count = os.cpu_count() or 2
+        env_workers = os.getenv('RENDER_WORKERS')
+        self.workers = workers if workers is not None else (int(env_workers) if env_workers else cpu_count)
+        self.encoder_threads = encoder_threads or int(os.getenv('RENDER_THREADS', '0')) or max(1, cpu_count // max(1, self.workers))
+        self._lock = threading.Lock()
+        self._executor = None
+        self._progress_queue = None
+        self._reporters = {}  # task_id -> (reporter, Event für die Endmarke)
+        self._task_ids = itertools.count(1)
+        self.submitted = 0
+        self.in_flight = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                mp_context = _get_mp_context()
+                if self._progress_queue is None:
+                    self._progress_queue = mp_context.Queue()
+                    threading.Thread(target=self._forward_progress, name='render-progress', daemon=True).start()
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context,
+                                                     initializer=_warm_worker,
+                                                     initargs=(self.encoder_threads, self._progress_queue))
+                print(f"🏭 Render pool started ({self.workers} workers, {self.encoder_threads} encoder threads each)")
+            return self._executor
+
+    def _forward_progress(self):
+        """Leitet Fortschritts-Events der Worker an den Empfänger des jeweiligen Auftrags weiter"""
+        while True:
+            try:
+                task_id, event_type, data = self._progress_queue.get()
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                entry = self._reporters.get(task_id)
+            if entry is None:
+                continue
+            reporter, done = entry
+            if event_type is None:
+                done.set()
+                continue
+            try:
+                reporter(event_type, data)
+            except Exception as e:
+                print(f"⚠️ Progress forwarding failed: {e}")
+
+    def warm_up(self):
+        """Startet alle Worker sofort (statt beim ersten Render-Auftrag)"""
+        if not self.enabled:
+            return
+        executor = self._get_executor()
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def run(self, func, *args, **kwargs):
+        """
+        Führt func(*args, **kwargs) in einem Render-Prozess aus und wartet auf das Ergebnis.
+        func muss eine Top-Level-Funktion sein (pickle). Ohne Pool oder bei einem
+        defekten Pool wird im aktuellen Thread gerendert. Erzeugte Dateien im
+        Output-Ordner werden im Storage-Index registriert (Worker haben keinen Index).
+        """
+        with time_stage(RENDER_STAGES.get(func.__name__, 'encode')):
+            result = self._run(func, *args, **kwargs)
+        get_storage_manager().register(result)
+        return result
+
+    def _run(self, func, *args, **kwargs):
+        if not self.enabled:
+            return func(*args, **kwargs)
+
+        reporter = get_reporter()
+        task_id = next(self._task_ids) if reporter else None
+        done = threading.Event()
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            if task_id is not None:
+                self._reporters[task_id] = (reporter, done)
+        executor = None
+        try:
+            executor = self._get_executor()
+            result = executor.submit(_run_task, task_id, func, args, kwargs).result()
+            if task_id is not None:
+                # Events laufen über eine eigene Queue - auf die Endmarke warten,
+                # damit z.B. 'mux' vor 'stage_done' beim Job ankommt
+                done.wait(timeout=5)
+            return result
+        except BrokenProcessPool:
+            print("⚠️ Render process pool broken, restarting and rendering in-thread")
+            with self._lock:
+                # Nur ersetzen, falls kein anderer Thread schon neu gestartet hat
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self._reporters.pop(task_id, None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'encoder_threads': self.encoder_threads,
+                'started': self._executor is not None,
+                'submitted': self.submitted,
+                'in_flight': self.in_flight
+            }
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+def get_render_pool() -> RenderPool:
+    """Gemeinsamer Render-Pool für alle Routen"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = RenderPool()
+        return _render_pool
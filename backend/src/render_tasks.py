@@ -0,0 +1,131 @@
+import os
+from ffmpeg_tools import probe_media, can_stream_copy, mux_stream_copy
+from encoder_profiles import get_encoder_profile
+from progress import report, moviepy_logger
+from storage_manager import new_artifact_path, atomic_output
+
+
+# Rendering-Tasks als Top-Level-Funktionen, damit sie auch in
+# Worker-Prozessen (ProcessPoolExecutor) ausgeführt werden können
+
+def combine_video_with_audio(video_file, audio_file, encoder_profile=None):
+    """
+    Kombiniert AI-Video mit Audio (Stream-Copy wenn möglich, sonst Re-Encode).
+    encoder_profile gilt nur für den Re-Encode.
+    """
+    try:
+        print("🎵 Combining AI video with audio...")
+        
+        if not os.path.exists(video_file) or not os.path.exists(audio_file):
+            print("❌ Video or audio file not found")
+            return None
+        
+        # Speichere finales Video (eindeutiger Name, atomar geschrieben)
+        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+        final_path = new_artifact_path(output_dir, 'free_ai_final', 'mp4')
+        
+        # Fast Path: Video-Stream nur kopieren und loopen
+        video_info = probe_media(video_file)
+        audio_info = probe_media(audio_file)
+        
+        with atomic_output(final_path) as tmp_path:
+            mode = 'reencode'
+            if can_stream_copy(video_info) and audio_info['duration']:
+                print(f"⚡ Stream-copy muxing ({video_info['video_codec']}, {audio_info['duration']:.1f}s audio)")
+                if mux_stream_copy(video_file, audio_file, tmp_path, audio_info['duration'],
+                                   audio_codec=audio_info['audio_codec']):
+                    mode = 'stream_copy'
+                else:
+                    print("⚠️ Stream copy failed, falling back to re-encode")
+            
+            if mode == 'reencode':
+                _combine_reencode(video_file, audio_file, tmp_path, encoder_profile)
+        
+        print(f"✅ Final FREE AI video created: {final_path}")
+        report('mux', status='done', mode=mode)
+        return final_path
+        
+    except Exception as e:
+        print(f"❌ Video-Audio combination failed: {e}")
+        return video_file  # Gib wenigstens das Video zurück
+
+def _combine_reencode(video_file, audio_file, final_path, encoder_profile=None):
+    """Kombiniert Video und Audio mit vollständigem MoviePy-Re-Encode"""
+    import moviepy.editor as mp
+    
+    # Lade Video und Audio
+    video_clip = mp.VideoFileClip(video_file)
+    audio_clip = mp.AudioFileClip(audio_file)
+    
+    print(f"📹 Video duration: {video_clip.duration:.1f}s")
+    print(f"🔊 Audio duration: {audio_clip.duration:.1f}s")
+    
+    # Passe Video-Länge an Audio an
+    if video_clip.duration < audio_clip.duration:
+        # Video ist kürzer - wiederhole es
+        loops_needed = int(audio_clip.duration / video_clip.duration) + 1
+        print(f"🔄 Looping video {loops_needed} times to match audio length")
+        video_clip = mp.concatenate_videoclips([video_clip] * loops_needed)
+    
+    # Schneide Video auf Audio-Länge
+    video_clip = video_clip.subclip(0, audio_clip.duration)
+    
+    # Kombiniere Video und Audio
+    final_clip = video_clip.set_audio(audio_clip)
+    
+    print("💾 Saving final video...")
+    profile = get_encoder_profile(encoder_profile)
+    final_clip.write_videofile(
+        final_path,
+        fps=24,
+        audio_codec='aac',
+        verbose=False,
+        logger=moviepy_logger('encode'),
+        **profile.moviepy_params(24)
+    )
+    
+    # Cleanup
+    video_clip.close()
+    audio_clip.close()
+    final_clip.close()
+
+def render_slide_video(audio_file, text, resolution='1080p', style='explainer', is_preview=False,
+                       output_file=None, encoder_profile=None, max_duration=None, slide_file=None):
+    """
+    Rendert ein Standard-Slide-Video (CPU-lastig, prozesstauglich).
+    slide_file kommt aus get_slide_image() im Hauptprozess (Slide-Cache nicht im Worker).
+    """
+    from video_generator import VideoGenerator
+    return VideoGenerator().create_video(audio_file, text, resolution=resolution, style=style,
+                                         is_preview=is_preview, output_file=output_file,
+                                         encoder_profile=encoder_profile, max_duration=max_duration,
+                                         slide_file=slide_file)
+
+def render_image_video(image_path, output_path, size=(1024, 576), duration=4.0, fps=24, encoder_profile=None):
+    """Erstellt aus einem Standbild ein Video mit leichter Zoom-Animation"""
+    import moviepy.editor as mp
+    from PIL import Image
+    from ken_burns import KenBurnsRenderer
+    
+    # Lade Bild
+    img = Image.open(image_path)
+    
+    # Zoom-Animation mit vorberechneten Transformationen
+    renderer = KenBurnsRenderer(img, size=size, duration=duration, fps=fps,
+                                zoom_start=1.0, zoom_end=1.1)
+    
+    # Erstelle Video-Clip
+    video_clip = mp.VideoClip(renderer.make_frame, duration=renderer.duration)
+    
+    with atomic_output(output_path) as tmp_path:
+        video_clip.write_videofile(
+            tmp_path,
+            fps=renderer.fps,
+            verbose=False,
+            logger=moviepy_logger('encode'),
+            **get_encoder_profile(encoder_profile).moviepy_params(renderer.fps)
+        )
+    
+    # Cleanup
+    video_clip.close()
+    return output_path
@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from metrics import CACHE_REQUESTS
+
+
+class ResultCache:
+    """
+    Memoization ganzer Generierungs-Requests.
+    Identische (kanonisierte) Requests liefern das vorhandene fertige Artefakt,
+    gleichzeitige identische Requests teilen sich einen laufenden Job (Single-Flight).
+    """
+
+    INDEX_FILENAME = '.result_cache.json'
+    URL_FIELDS = ('url', 'audio_url')
+
+    def __init__(self, output_dir: str, max_entries: int = None):
+        self.output_dir = output_dir
+        self.max_entries = max_entries or int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '1000'))
+        self.index_path = os.path.join(output_dir, self.INDEX_FILENAME)
+        os.makedirs(output_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> {'result', 'created'}
+        self._inflight = {}            # key -> {'event', 'result', 'error'} (synchrone Routen)
+        self._inflight_jobs = {}       # key -> Job (asynchrone Routen)
+        self._load_index()
+
+    @staticmethod
+    def make_key(kind: str, **payload) -> str:
+        """
+        Kanonisiert den Request (Key-Reihenfolge, äußerer Whitespace) und hasht ihn.
+        Innerer Whitespace bleibt erhalten: Zeilenumbrüche ändern das Slide-Layout.
+        """
+        def canonical(value):
+            if isinstance(value, str):
+                return value.strip()
+            if isinstance(value, dict):
+                return {k: canonical(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [canonical(v) for v in value]
+            return value
+
+        data = json.dumps({'kind': kind, 'payload': canonical(payload)}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def _artifacts_exist(self, result: dict) -> bool:
+        for field in self.URL_FIELDS:
+            url = result.get(field)
+            if url and not os.path.exists(os.path.join(self.output_dir, os.path.basename(url))):
+                return False
+        return True
+
+    def get(self, key: str):
+        """Gecachtes Ergebnis, solange alle referenzierten Dateien noch existieren"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not self._artifacts_exist(entry['result']):
+                del self._entries[key]
+                self._save_index()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_REQUESTS.inc(cache='result', result='hit')
+            return dict(entry['result'])
+
+    def put(self, key: str, result: dict):
+        with self._lock:
+            self._entries[key] = {'result': result, 'created': time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save_index()
+
+    def run(self, key: str, compute):
+        """
+        Single-Flight für synchrone Routen: Nur der erste Aufrufer führt compute() aus,
+        gleichzeitige identische Aufrufer warten auf dessen Ergebnis.
+        Gibt (result, status) mit status 'hit', 'miss' oder 'coalesced' zurück.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, 'hit'
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = {'event': threading.Event(), 'result': None, 'error': None}
+                self._inflight[key] = flight
+                self.misses += 1
+                CACHE_REQUESTS.inc(cache='result', result='miss')
+            else:
+                self.coalesced += 1
+                CACHE_REQUESTS.inc(cache='result', result='coalesced')
+
+        if not leader:
+            flight['event'].wait()
+            if flight['error'] is not None:
+                raise flight['error']
+            return dict(flight['result']), 'coalesced'
+
+        try:
+            result = compute()
+            self.put(key, result)
+            flight['result'] = result
+            return result, 'miss'
+        except Exception as e:
+            flight['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight['event'].set()
+
+    def submit_job(self, key: str, submit):
+        """
+        Single-Flight für asynchrone Routen: Läuft bereits ein Job für den Schlüssel,
+        wird dieser zurückgegeben, sonst wird über submit() ein neuer eingereiht.
+        Gibt (job, coalesced) zurück.
+        """
+        with self._lock:
+            job = self._inflight_jobs.get(key)
+            if job is not None and not job.done:
+                self.coalesced += 1
+                CACHE_REQUESTS.inc(cache='result', result='coalesced')
+                return job, True
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache='result', result='miss')
+            job = submit()
+            self._inflight_jobs[key] = job
+            return job, False
+
+    def finish_job(self, key: str, result: dict = None):
+        """Vom Job am Ende aufgerufen: Ergebnis cachen und In-Flight-Eintrag entfernen"""
+        if result is not None:
+            self.put(key, result)
+        with self._lock:
+            self._inflight_jobs.pop(key, None)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = sorted(data.get('entries', {}).items(), key=lambda item: item[1].get('created', 0))
+            self._entries.update(entries)
+        except (OSError, ValueError):
+            pass
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': dict(self._entries)}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ Could not save result cache index: {e}")
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._inflight) + len(self._inflight_jobs)
+            }
@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Dateien, die der Storage-Manager verwaltet (Indizes und Temp-Dateien nicht)
+MEDIA_EXTENSIONS = ('.mp3', '.mp4', '.wav', '.avi', '.png', '.jpg', '.npy')
+
+
+def new_artifact_path(output_dir: str, prefix: str, ext: str = 'mp4', key: str = None) -> str:
+    """
+    Kollisionsfreier Artefakt-Name ohne Zeitstempel: Inhalts-/Request-Hash (key)
+    oder eine zufällige UUID. Funktioniert auch in Render-Prozessen (kein Index nötig).
+    """
+    return os.path.join(output_dir, f"{prefix}_{key or uuid.uuid4().hex}.{ext}")
+
+
+@contextmanager
+def atomic_output(final_path: str):
+    """
+    Liefert einen Temp-Pfad neben final_path (gleiche Endung, damit FFmpeg das Format
+    erkennt). Nach erfolgreichem Block wird per os.replace atomar umbenannt, Leser
+    sehen nie halb geschriebene Dateien. Bei Fehlern wird die Temp-Datei gelöscht.
+    """
+    base, ext = os.path.splitext(final_path)
+    tmp_path = f"{base}.{uuid.uuid4().hex[:8]}.tmp{ext}"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, final_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class StorageManager:
+    """
+    Index aller Artefakte im Output-Ordner (Größe, Erstellung, letzter Zugriff)
+    mit Byte-Quota, TTL und LRU-Eviction nicht gepinnter Dateien im Hintergrund.
+    Statusabfragen kommen aus laufenden Summen statt aus Verzeichnis-Scans.
+    """
+
+    INDEX_FILENAME = '.storage_index.json'
+
+    def __init__(self, root_dir: str, max_bytes: int = None, ttl_seconds: float = None,
+                 sweep_interval: float = None):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('STORAGE_MAX_MB', '10000')) * 1024 * 1024
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('STORAGE_TTL_HOURS', '72')) * 3600
+        self.sweep_interval = sweep_interval or float(os.getenv('STORAGE_SWEEP_SECONDS', '300'))
+        self.index_path = os.path.join(root_dir, self.INDEX_FILENAME)
+        os.makedirs(root_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries = OrderedDict()  # name -> {'size', 'created', 'last_access', 'pinned'}
+        self._total_bytes = 0
+        self._dirty = False
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+        self._sweeper = None
+        self._stop = threading.Event()
+
+        if not self._load_index():
+            self.reconcile()
+
+    def _is_managed(self, name: str) -> bool:
+        return not name.startswith('.') and '.tmp' not in name and name.lower().endswith(MEDIA_EXTENSIONS)
+
+    def _name_for(self, path: str):
+        """Dateiname relativ zum Root, None für Dateien außerhalb des Output-Ordners"""
+        if not isinstance(path, str):
+            return None
+        path = os.path.abspath(path)
+        if os.path.dirname(path) != os.path.abspath(self.root_dir):
+            return None
+        name = os.path.basename(path)
+        return name if self._is_managed(name) else None
+
+    def register(self, path, pinned: bool = False, sha256: str = None):
+        """
+        Nimmt ein fertiges Artefakt in den Index auf (idempotent).
+        Werte, die keine Datei im Output-Ordner sind, werden ignoriert, damit
+        Ergebnisse aus Render-Prozessen ungeprüft übergeben werden können.
+        sha256 ist ein bereits bekannter Inhalts-Hash (z. B. beim Download berechnet).
+        """
+        name = self._name_for(path)
+        if name is None:
+            return
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return
+        now = time.time()
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous:
+                self._total_bytes -= previous['size']
+            self._entries[name] = {
+                'size': stat_result.st_size,
+                'created': previous['created'] if previous else now,
+                'last_access': now,
+                'pinned': pinned or bool(previous and previous['pinned'])
+            }
+            if sha256:
+                self._entries[name]['sha256'] = sha256
+            self._total_bytes += stat_result.st_size
+            self._dirty = True
+
+    def touch(self, filename: str):
+        """Markiert einen Zugriff (z. B. Auslieferung über /output)"""
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry:
+                entry['last_access'] = time.time()
+                self._entries.move_to_end(filename)
+                self._dirty = True
+
+    def get_sha256(self, filename: str, size: int):
+        """Bekannter Inhalts-Hash, falls die Größe noch zum Index passt"""
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry and entry['size'] == size:
+                return entry.get('sha256')
+            return None
+
+    def pin(self, filename: str, pinned: bool = True):
+        """Gepinnte Artefakte werden nie automatisch gelöscht"""
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry:
+                entry['pinned'] = pinned
+                self._dirty = True
+            return entry is not None
+
+    def forget(self, path: str):
+        """Entfernt einen Eintrag, dessen Datei von anderer Stelle gelöscht wurde"""
+        with self._lock:
+            entry = self._entries.pop(os.path.basename(path), None)
+            if entry:
+                self._total_bytes -= entry['size']
+                self._dirty = True
+
+    def _remove(self, name: str) -> int:
+        """Löscht Datei und Eintrag (Lock muss gehalten werden), gibt die Größe zurück"""
+        entry = self._entries.pop(name)
+        self._total_bytes -= entry['size']
+        self._dirty = True
+        try:
+            os.remove(os.path.join(self.root_dir, name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Could not delete {name}: {e}")
+        return entry['size']
+
+    def evict(self) -> dict:
+        """Löscht abgelaufene (TTL) und über der Quota liegende LRU-Artefakte"""
+        deleted = 0
+        freed = 0
+        now = time.time()
+        with self._lock:
+            if self.ttl_seconds > 0:
+                for name, entry in list(self._entries.items()):
+                    if not entry['pinned'] and now - entry['last_access'] > self.ttl_seconds:
+                        freed += self._remove(name)
+                        deleted += 1
+
+            # OrderedDict ist nach letztem Zugriff sortiert (ältester zuerst)
+            for name in list(self._entries.keys()):
+                if self._total_bytes <= self.max_bytes:
+                    break
+                if not self._entries[name]['pinned']:
+                    freed += self._remove(name)
+                    deleted += 1
+
+            self.evicted_files += deleted
+            self.evicted_bytes += freed
+
+        if deleted:
+            print(f"🧹 Storage eviction: {deleted} files, {freed / (1024 * 1024):.1f} MB freed")
+        return {'deleted_files': deleted, 'freed_bytes': freed}
+
+    def cleanup(self, include_pinned: bool = False) -> dict:
+        """Löscht alle (nicht gepinnten) Artefakte - für /api/cleanup"""
+        deleted = 0
+        freed = 0
+        with self._lock:
+            for name, entry in list(self._entries.items()):
+                if include_pinned or not entry['pinned']:
+                    freed += self._remove(name)
+                    deleted += 1
+        self.save()
+        return {'deleted_files': deleted, 'freed_bytes': freed}
+
+    def reconcile(self):
+        """
+        Gleicht den Index mit dem Verzeichnis ab (einmal beim Start ohne Index
+        und periodisch im Hintergrund): fremd erzeugte Dateien werden aufgenommen,
+        extern gelöschte entfernt.
+        """
+        try:
+            names = {entry.name: entry for entry in os.scandir(self.root_dir)
+                     if entry.is_file() and self._is_managed(entry.name)}
+        except OSError:
+            return
+
+        with self._lock:
+            for name in [name for name in self._entries if name not in names]:
+                self._total_bytes -= self._entries.pop(name)['size']
+                self._dirty = True
+            for name, dir_entry in names.items():
+                if name in self._entries:
+                    continue
+                stat_result = dir_entry.stat()
+                self._entries[name] = {
+                    'size': stat_result.st_size,
+                    'created': stat_result.st_mtime,
+                    'last_access': stat_result.st_mtime,
+                    'pinned': False
+                }
+                self._total_bytes += stat_result.st_size
+                self._dirty = True
+            # Neu aufgenommene Dateien nach letztem Zugriff einsortieren
+            self._entries = OrderedDict(sorted(self._entries.items(), key=lambda item: item[1]['last_access']))
+
+    def start(self):
+        """Startet den Hintergrund-Thread für Abgleich und Eviction"""
+        if self._sweeper is not None:
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop, name='storage-sweeper', daemon=True)
+        self._sweeper.start()
+        print(f"🗄️ Storage manager started (quota: {self.max_bytes / (1024 * 1024):.0f} MB, "
+              f"TTL: {self.ttl_seconds / 3600:.1f} h)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _sweep_loop(self):
+        # Erster Durchlauf sofort (Dateien aus früheren Läufen aufnehmen)
+        while True:
+            try:
+                self.reconcile()
+                self.evict()
+                self.save()
+            except Exception as e:
+                print(f"⚠️ Storage sweep failed: {e}")
+            if self._stop.wait(self.sweep_interval):
+                break
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        entries = sorted(data.get('entries', {}).items(), key=lambda item: item[1].get('last_access', 0))
+        for name, entry in entries:
+            if os.path.exists(os.path.join(self.root_dir, name)):
+                self._entries[name] = entry
+                self._total_bytes += entry['size']
+        return True
+
+    def save(self):
+        """Schreibt den Index atomar (nur wenn er sich geändert hat)"""
+        # Save-Lock über Snapshot, Schreiben und Umbenennen: parallele Aufrufe (Sweeper,
+        # /api/cleanup) schreiben nacheinander, ein älterer Stand überholt keinen neueren
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = {'entries': {name: dict(entry) for name, entry in self._entries.items()}}
+                self._dirty = False
+            # Eigener Temp-Name je Prozess/Thread: nie halb geschriebene fremde Dateien umbenennen
+            tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.index_path)
+            except OSError as e:
+                print(f"⚠️ Could not save storage index: {e}")
+                with self._lock:
+                    self._dirty = True
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def get_stats(self) -> dict:
+        """O(1): laufende Summen statt Verzeichnis-Scan"""
+        with self._lock:
+            return {
+                'files': len(self._entries),
+                'size_mb': round(self._total_bytes / (1024 * 1024), 2),
+                'quota_mb': round(self.max_bytes / (1024 * 1024), 2),
+                'usage_percent': round(self._total_bytes / self.max_bytes * 100, 1) if self.max_bytes else 0.0,
+                'ttl_hours': round(self.ttl_seconds / 3600, 1),
+                'evicted_files': self.evicted_files,
+                'evicted_mb': round(self.evicted_bytes / (1024 * 1024), 2)
+            }
+
+
+_storage_manager = None
+_storage_manager_lock = threading.Lock()
+
+def get_storage_manager() -> StorageManager:
+    """Gemeinsamer Storage-Manager für den Output-Ordner"""
+    global _storage_manager
+    with _storage_manager_lock:
+        if _storage_manager is None:
+            output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+            _storage_manager = StorageManager(output_dir)
+        return _storage_manager
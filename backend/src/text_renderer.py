@@ -0,0 +1,115 @@
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+
+# Zeilenabstand relativ zur Schriftgröße
+LINE_SPACING = 1.25
+
+
+@lru_cache(maxsize=64)
+def get_font(font: str = None, size: int = 40):
+    """
+    Gecachtes ImageFont-Objekt. font ist ein TrueType-Dateiname oder -Pfad;
+    ohne Angabe wird die mit Pillow ausgelieferte Schrift verwendet, damit
+    Slides auf jedem Host identisch aussehen.
+    """
+    if font:
+        try:
+            return ImageFont.truetype(font, size)
+        except OSError:
+            print(f"⚠️ Font not found: {font}, using built-in font")
+    return ImageFont.load_default(size=size)
+
+
+def _split_long_word(word: str, font, max_width: float):
+    """Bricht ein Wort, das allein breiter als die Zeile ist, zeichenweise um"""
+    parts = []
+    current = ''
+    for char in word:
+        if current and font.getlength(current + char) > max_width:
+            parts.append(current)
+            current = char
+        else:
+            current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def wrap_text(text: str, font, max_width: float):
+    """Zeilenumbruch an Wortgrenzen nach gemessener Breite (Absätze bleiben erhalten)"""
+    lines = []
+    for paragraph in text.splitlines() or ['']:
+        current = ''
+        for word in paragraph.split():
+            candidate = f"{current} {word}" if current else word
+            if font.getlength(candidate) <= max_width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            if font.getlength(word) <= max_width:
+                current = word
+            else:
+                *full_parts, current = _split_long_word(word, font, max_width)
+                lines.extend(full_parts)
+        lines.append(current)
+    return lines
+
+
+def fit_text(text: str, max_width: float, max_height: float, fontsize: int,
+             font: str = None, min_fontsize: int = 12):
+    """
+    Auto-Fit: verkleinert die Schrift ausgehend von fontsize, bis der umbrochene
+    Text in die Box passt. Gibt (ImageFont, Zeilen, Zeilenhöhe) zurück.
+    """
+    size = max(fontsize, min_fontsize)
+    while True:
+        image_font = get_font(font, size)
+        lines = wrap_text(text, image_font, max_width)
+        line_height = int(size * LINE_SPACING)
+        if len(lines) * line_height <= max_height or size <= min_fontsize:
+            return image_font, lines, line_height
+        size = max(min_fontsize, int(size * 0.9))
+
+
+def render_text_image(text: str, size, fontsize: int, color='white', bg_color='black',
+                      font: str = None, margin: float = 0.05) -> Image.Image:
+    """Rastert zentrierten, umbrochenen Text in-process (ersetzt ImageMagick/TextClip)"""
+    width, height = size
+    pad_x = int(width * margin)
+    pad_y = int(height * margin)
+    image_font, lines, line_height = fit_text(text, width - 2 * pad_x, height - 2 * pad_y,
+                                              fontsize, font=font)
+
+    image = Image.new('RGB', (width, height), bg_color)
+    draw = ImageDraw.Draw(image)
+    y = (height - len(lines) * line_height) / 2 + line_height / 2
+    for line in lines:
+        if line:
+            # Anker 'mm': Zeile horizontal und vertikal um (x, y) zentriert
+            draw.text((width / 2, y), line, font=image_font, fill=color, anchor='mm')
+        y += line_height
+    return image
+
+
+def render_text_frame(text: str, size, fontsize: int, color='white', bg_color='black',
+                      font: str = None, out: np.ndarray = None) -> np.ndarray:
+    """
+    Wie render_text_image, aber als RGB-Frame (H, W, 3) uint8 für MoviePy.
+    out ist optional ein vorab allokierter Puffer, der direkt befüllt wird.
+    """
+    image = render_text_image(text, size, fontsize, color=color, bg_color=bg_color, font=font)
+    if out is None:
+        return np.array(image)
+    np.copyto(out, np.asarray(image))
+    return out
+
+
+def save_text_image(path: str, text: str, size, fontsize: int, color='white', bg_color='black',
+                    font: str = None):
+    """Schreibt die Slide als PNG (schwache Kompression - Datei ist nur Zwischenstufe)"""
+    image = render_text_image(text, size, fontsize, color=color, bg_color=bg_color, font=font)
+    image.save(path, format='PNG', compress_level=1)
+    return path
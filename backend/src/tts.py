@@ -1,39 +1,132 @@
 import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from gtts import gTTS
+from audio_cache import AudioCache
+from ffmpeg_tools import concat_files
+from metrics import time_stage
+
+# Ab dieser Textlänge wird satzweise und parallel synthetisiert
+LONG_TEXT_THRESHOLD = int(os.getenv('TTS_LONG_TEXT_THRESHOLD', '400'))
+MAX_CHUNK_CHARS = int(os.getenv('TTS_MAX_CHUNK_CHARS', '300'))
+
+# Vorschau: nur die ersten Sekunden (grob 15 Zeichen gesprochener Text pro Sekunde)
+PREVIEW_SECONDS = float(os.getenv('PREVIEW_SECONDS', '10'))
+CHARS_PER_SECOND = 15
+
+# Begrenzte Parallelität für Chunk-Synthese (gTTS-Requests)
+_chunk_pool = ThreadPoolExecutor(max_workers=int(os.getenv('TTS_PARALLELISM', '4')), thread_name_prefix='tts-chunk')
+
+_audio_cache = None
+_audio_cache_lock = threading.Lock()
+
+def get_audio_cache() -> AudioCache:
+    """Gemeinsamer TTS-Cache für alle TextToSpeech-Instanzen"""
+    global _audio_cache
+    with _audio_cache_lock:
+        if _audio_cache is None:
+            output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+            _audio_cache = AudioCache(output_dir)
+        return _audio_cache
 
 class TextToSpeech:
     def __init__(self):
-        pass
+        self.cache = get_audio_cache()
 
     def generate_speech(self, text: str, language: str = 'de', voice: str = 'anna', 
                        speech_speed: str = 'normal', is_preview: bool = False) -> str:
         """
         Converts text to speech and saves it to an audio file.
+        Lange Texte werden satzweise parallel synthetisiert und zusammengefügt.
         """
         try:
-            print(f"🔊 Generating speech: {language}, voice: {voice}, speed: {speech_speed}")
+            with time_stage('tts'):
+                print(f"🔊 Generating speech: {language}, voice: {voice}, speed: {speech_speed}")
+                
+                params = dict(language=language, voice=voice, speech_speed=speech_speed, engine='gtts')
+                
+                if len(text) > LONG_TEXT_THRESHOLD:
+                    chunks = split_sentences(text, MAX_CHUNK_CHARS)
+                    if len(chunks) > 1:
+                        output_file = self._generate_chunked(text, chunks, params)
+                        print(f"✅ Speech generated ({len(chunks)} chunks): {output_file}")
+                        return output_file
+                
+                output_file = self._synthesize_cached(text, params)
+                
+                print(f"✅ Speech generated: {output_file}")
+                return output_file
             
-            # Erstelle Ausgabepfad
-            output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
-            os.makedirs(output_dir, exist_ok=True)
+        except Exception as e:
+            print(f"❌ Error generating speech: {str(e)}")
+            return None
+
+    def generate_preview_speech(self, text: str, max_seconds: float = PREVIEW_SECONDS, language: str = 'de',
+                                voice: str = 'anna', speech_speed: str = 'normal') -> str:
+        """
+        Audio für eine Vorschau: nur die führenden Sätze für etwa max_seconds.
+        Die Chunks haben dieselben Cache-Schlüssel wie im Long-Form-Modus, das finale
+        Rendering synthetisiert sie daher nicht erneut. Kurze Texte werden komplett
+        synthetisiert (gleicher Schlüssel wie generate_speech).
+        """
+        try:
+            if len(text) <= LONG_TEXT_THRESHOLD:
+                return self.generate_speech(text, language=language, voice=voice, speech_speed=speech_speed)
             
-            # Generiere eindeutigen Dateinamen
-            import hashlib
-            text_hash = hashlib.md5(text.encode()).hexdigest()
-            prefix = "preview_" if is_preview else "full_"
-            output_file = os.path.join(output_dir, f"{prefix}{text_hash}.mp3")
+            params = dict(language=language, voice=voice, speech_speed=speech_speed, engine='gtts')
+            chunks = split_sentences(text, MAX_CHUNK_CHARS)
             
-            # Verwende gTTS für Text-zu-Sprache
-            tts = gTTS(text=text, lang=language, slow=(speech_speed == 'slow'))
-            tts.save(output_file)
+            budget = max_seconds * CHARS_PER_SECOND
+            leading = []
+            for chunk in chunks:
+                leading.append(chunk)
+                budget -= len(chunk)
+                if budget <= 0:
+                    break
             
-            print(f"✅ Speech generated: {output_file}")
-            return output_file
+            print(f"🔊 Generating preview speech: {len(leading)}/{len(chunks)} chunks")
+            if len(leading) == 1:
+                return self._synthesize_cached(leading[0], params)
+            return self._generate_chunked(' '.join(leading), leading, params)
             
         except Exception as e:
-            print(f"❌ Error generating speech: {str(e)}")
+            print(f"❌ Error generating preview speech: {str(e)}")
             return None
 
+    def _synthesize_cached(self, text: str, params: dict) -> str:
+        """Synthetisiert einen Text über den Cache (Schlüssel über alle Syntheseparameter)"""
+        key = AudioCache.make_key(text=text, **params)
+        
+        def synthesize(tmp_path):
+            # Verwende gTTS für Text-zu-Sprache
+            tts = gTTS(text=text, lang=params['language'], slow=(params['speech_speed'] == 'slow'))
+            tts.save(tmp_path)
+        
+        return self.cache.get_or_create(key, synthesize)
+
+    def _generate_chunked(self, text: str, chunks, params: dict) -> str:
+        """
+        Long-Form-Modus: jeder Satz-Chunk wird einzeln gecacht und parallel
+        synthetisiert, danach ohne Re-Encode zu einer Datei zusammengefügt.
+        Wird ein Satz geändert, muss nur dieser Chunk neu synthetisiert werden.
+        """
+        key = AudioCache.make_key(text=text, mode='chunked', max_chunk_chars=MAX_CHUNK_CHARS, **params)
+        
+        def assemble(tmp_path):
+            futures = [_chunk_pool.submit(self._synthesize_cached, chunk, params) for chunk in chunks]
+            chunk_files = [future.result() for future in futures]
+            
+            if not concat_files(chunk_files, tmp_path):
+                # MP3 ist framebasiert - einfaches Aneinanderhängen ist ein gültiger Fallback
+                with open(tmp_path, 'wb') as out:
+                    for chunk_file in chunk_files:
+                        with open(chunk_file, 'rb') as f:
+                            shutil.copyfileobj(f, out)
+        
+        return self.cache.get_or_create(key, assemble)
+
     def preview_translation(self, text: str, target_language: str) -> dict:
         """
         Zeigt Vorschau der Übersetzung
@@ -56,3 +149,26 @@ class TextToSpeech:
             
         except Exception as e:
             return {'error': str(e)}
+
+
+def split_sentences(text: str, max_chars: int = MAX_CHUNK_CHARS):
+    """
+    Teilt Text an Satzgrenzen. Jeder Satz ist ein eigener Chunk (stabile Cache-Schlüssel
+    bei Änderungen), zu lange Sätze werden an Kommas bzw. Leerzeichen weiter geteilt.
+    """
+    chunks = []
+    for sentence in re.split(r'(?<=[.!?…;:])\s+', text.strip()):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            # Komma bleibt am Chunk, Leerzeichen fällt weg, harter Schnitt genau bei max_chars
+            cut = sentence.rfind(', ', 0, max_chars)
+            if cut > 0:
+                end, rest = cut + 1, cut + 1
+            else:
+                cut = sentence.rfind(' ', 0, max_chars)
+                end, rest = (cut, cut + 1) if cut > 0 else (max_chars, max_chars)
+            chunks.append(sentence[:end].strip())
+            sentence = sentence[rest:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
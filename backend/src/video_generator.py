@@ -1,6 +1,33 @@
 import os
+import threading
 import moviepy.editor as mp
+from concurrent.futures import ThreadPoolExecutor
 from moviepy.config import change_settings
+from ffmpeg_tools import encode_still_image, concat_files
+from encoder_profiles import get_encoder_profile
+from storage_manager import atomic_output, get_storage_manager, new_artifact_path
+from progress import report, moviepy_logger, propagate
+from audio_cache import AudioCache
+from tts import TextToSpeech, split_sentences
+from render_pool import get_render_pool
+from render_tasks import render_slide_video
+from text_renderer import save_text_image, render_text_frame
+
+# Maximale Länge eines Segments im inkrementellen Modus
+MAX_SEGMENT_CHARS = int(os.getenv('VIDEO_MAX_SEGMENT_CHARS', '300'))
+
+# Schrift für Slides (TrueType-Datei, Teil des Slide-Cache-Schlüssels).
+# Ohne Angabe: mit Pillow ausgelieferte Schrift, auf jedem Host identisch
+SLIDE_FONT = os.getenv('SLIDE_FONT') or None
+
+# Slide-Stile: Schriftgröße bei 720p (skaliert mit der Bildhöhe, Auto-Fit verkleinert
+# bei langem Text), Text- und Hintergrundfarbe
+SLIDE_STYLES = {
+    'minimal': {'fontsize': 40, 'color': 'white', 'bg_color': 'black'},
+    'presentation': {'fontsize': 50, 'color': 'white', 'bg_color': 'navy'},
+    'tutorial': {'fontsize': 45, 'color': 'yellow', 'bg_color': 'darkblue'},
+    'explainer': {'fontsize': 35, 'color': 'white', 'bg_color': 'darkgreen'}
+}
 
 # Setze den Pfad zu FFmpeg
 ffmpeg_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ffmpeg', 'ffmpeg.exe')
@@ -8,69 +35,153 @@ if os.path.exists(ffmpeg_path):
     change_settings({"FFMPEG_BINARY": ffmpeg_path})
     print(f"Found FFmpeg at: {ffmpeg_path}")
 
+_segment_cache = None
+_segment_cache_lock = threading.Lock()
+
+def get_segment_cache() -> AudioCache:
+    """Inhaltsadressierter Cache für gerenderte Video-Segmente"""
+    global _segment_cache
+    with _segment_cache_lock:
+        if _segment_cache is None:
+            output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+            max_bytes = int(os.getenv('SEGMENT_CACHE_MAX_MB', '2000')) * 1024 * 1024
+            _segment_cache = AudioCache(output_dir, max_bytes=max_bytes, prefix='segment_',
+                                        index_filename='.segment_cache_index.json')
+        return _segment_cache
+
+_slide_cache = None
+_slide_cache_lock = threading.Lock()
+
+def get_slide_cache() -> AudioCache:
+    """
+    Cache für gerasterte Slide-Bilder (PNG) nach Text, Stil, Auflösung und Schrift.
+    Nur im Hauptprozess verwenden (ein Index, ein Budget) - Render-Worker bekommen
+    die fertige Slide über get_slide_image() als Pfad übergeben.
+    """
+    global _slide_cache
+    with _slide_cache_lock:
+        if _slide_cache is None:
+            output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+            max_bytes = int(os.getenv('SLIDE_CACHE_MAX_MB', '200')) * 1024 * 1024
+            _slide_cache = AudioCache(output_dir, max_bytes=max_bytes, prefix='slide_',
+                                      index_filename='.slide_cache_index.json')
+        return _slide_cache
+
+def get_video_size(resolution: str):
+    """Bildgröße (Breite, Höhe) zur Auflösung, Standard 1080p"""
+    if resolution == '360p':
+        return (640, 360)
+    elif resolution == '480p':
+        return (854, 480)
+    elif resolution == '720p':
+        return (1280, 720)
+    elif resolution == '1440p':
+        return (2560, 1440)
+    elif resolution == '2160p':
+        return (3840, 2160)
+    return (1920, 1080)
+
+def get_slide_params(resolution: str = '1080p', style: str = 'explainer'):
+    """Bildgröße und Stil-Parameter der Slide, Schriftgröße relativ zur Bildhöhe (Basis 720p)"""
+    size = get_video_size(resolution)
+    slide_style = dict(SLIDE_STYLES.get(style, SLIDE_STYLES['explainer']))
+    slide_style['fontsize'] = int(slide_style['fontsize'] * size[1] / 720)
+    return size, slide_style
+
+def get_slide_image(text: str, resolution: str = '1080p', style: str = 'explainer') -> str:
+    """
+    Liefert das Slide-Bild als PNG aus dem Slide-Cache. Vorlagen, Retries und
+    doppelte Batch-Einträge rastern denselben Text nur einmal.
+    """
+    size, slide_style = get_slide_params(resolution, style)
+    key = AudioCache.make_key(text=text, size=list(size), font=SLIDE_FONT, renderer='pillow', **slide_style)
+    
+    def rasterize(tmp_path):
+        # Pillow statt ImageMagick: kein Subprozess, Zeilenumbruch und Auto-Fit
+        save_text_image(tmp_path, text, size, font=SLIDE_FONT, **slide_style)
+    
+    return get_slide_cache().get_or_create(key, rasterize, ext='png')
+
 class VideoGenerator:
     def __init__(self):
         pass
 
     def create_video(self, audio_file: str, text: str, resolution: str = '1080p', 
-                    style: str = 'explainer', music: str = 'none', is_preview: bool = False):
+                    style: str = 'explainer', music: str = 'none', is_preview: bool = False,
+                    render_mode: str = 'auto', output_file: str = None, encoder_profile: str = None,
+                    max_duration: float = None, slide_file: str = None):
         """
         Creates a video using the provided audio file and text.
+        render_mode 'auto' kodiert die statische Slide als Standbild per FFmpeg,
+        'moviepy' erzwingt das Frame-für-Frame-Rendering.
+        encoder_profile wählt Preset/CRF/GOP (Standard: Vorschau- bzw. Finalprofil).
+        max_duration begrenzt das Video auf die ersten Sekunden des Audios (Vorschau).
+        slide_file ist das vorab gerasterte Slide-PNG (sonst aus dem Slide-Cache).
         """
         try:
             # Überprüfe, ob die Audiodatei existiert
             if not os.path.exists(audio_file):
                 raise FileNotFoundError(f"Audio file not found: {audio_file}")
             
-            print(f"🎬 Creating video: {resolution}, style: {style}")
+            print(f"🎬 Creating video: {resolution}, style: {style}, profile: {encoder_profile or 'default'}")
             
             # Erstelle Ausgabepfad
             output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
             os.makedirs(output_dir, exist_ok=True)
             
-            prefix = "preview_" if is_preview else "video_"
-            output_file = os.path.join(output_dir, f"{prefix}{os.path.basename(audio_file).split('.')[0]}.mp4")
+            profile = get_encoder_profile(encoder_profile, is_preview)
+            
+            if output_file is None:
+                # Name aus allen Render-Parametern: Varianten überschreiben sich nicht
+                render_key = AudioCache.make_key(text=text, audio=os.path.basename(audio_file), resolution=resolution,
+                                                 style=style, encoder_profile=profile.name, is_preview=is_preview,
+                                                 max_duration=max_duration, render_mode=render_mode)
+                prefix = f"preview_{resolution}" if is_preview else "video"
+                output_file = new_artifact_path(output_dir, prefix, 'mp4', key=render_key[:32])
             
             # Lade die Audiodatei
             audio_clip = mp.AudioFileClip(audio_file)
+            if max_duration and audio_clip.duration > max_duration:
+                audio_clip = audio_clip.subclip(0, max_duration)
+            
+            fps = 24 if is_preview else 30
+            
+            # Fast Path: die Slide ändert sich nie - ein Standbild reicht
+            if render_mode == 'auto':
+                # Slide-Bild (in Render-Workern vom Hauptprozess übergeben)
+                if slide_file is None:
+                    slide_file = get_slide_image(text, resolution, style)
+                try:
+                    # Atomar: Leser sehen nie eine halb kodierte Datei
+                    with atomic_output(output_file) as tmp_path:
+                        if not self._encode_static_slide(slide_file, audio_file, tmp_path, audio_clip.duration,
+                                                         fps, profile):
+                            raise RuntimeError('Static slide encoding failed')
+                    audio_clip.close()
+                    print(f"✅ Video created (static slide): {output_file}")
+                    report('encode', percent=100, mode='still_image')
+                    return output_file
+                except RuntimeError:
+                    print("⚠️ Static slide encoding failed, falling back to MoviePy rendering")
             
-            # Bestimme Auflösung
-            if resolution == '720p':
-                size = (1280, 720)
-            elif resolution == '1440p':
-                size = (2560, 1440)
-            elif resolution == '2160p':
-                size = (3840, 2160)
-            else:  # 1080p default
-                size = (1920, 1080)
-            
-            # Erstelle Text-Clip basierend auf Stil
-            if style == 'minimal':
-                txt_clip = mp.TextClip(text, fontsize=40, color='white', bg_color='black', size=size)
-            elif style == 'presentation':
-                txt_clip = mp.TextClip(text, fontsize=50, color='white', bg_color='navy', size=size)
-            elif style == 'tutorial':
-                txt_clip = mp.TextClip(text, fontsize=45, color='yellow', bg_color='darkblue', size=size)
-            else:  # explainer default
-                txt_clip = mp.TextClip(text, fontsize=35, color='white', bg_color='darkgreen', size=size)
-            
-            txt_clip = txt_clip.set_duration(audio_clip.duration)
+            # Slide direkt als NumPy-Frame rastern (kein PNG-Umweg)
+            size, slide_style = get_slide_params(resolution, style)
+            frame = render_text_frame(text, size, font=SLIDE_FONT, **slide_style)
+            txt_clip = mp.ImageClip(frame).set_duration(audio_clip.duration)
             
             # Kombiniere Audio und Text
             video_clip = txt_clip.set_audio(audio_clip)
             
             # Schreibe das Video
-            fps = 24 if is_preview else 30
-            bitrate = '2000k' if is_preview else '5000k'
-            
-            video_clip.write_videofile(
-                output_file, 
-                fps=fps, 
-                codec='libx264',
-                bitrate=bitrate,
-                verbose=False,
-                logger=None
-            )
+            with atomic_output(output_file) as tmp_path:
+                video_clip.write_videofile(
+                    tmp_path, 
+                    fps=fps, 
+                    audio_codec='aac',
+                    verbose=False,
+                    logger=moviepy_logger('encode'),
+                    **profile.moviepy_params(fps)
+                )
             
             # Cleanup
             audio_clip.close()
@@ -83,3 +194,73 @@ class VideoGenerator:
         except Exception as e:
             print(f"❌ Error creating video: {str(e)}")
             return None
+
+    def create_incremental_video(self, text: str, resolution: str = '1080p', style: str = 'explainer',
+                                 language: str = 'de', voice: str = 'anna', speech_speed: str = 'normal',
+                                 is_preview: bool = False, encoder_profile: str = None):
+        """
+        Inkrementelles Rendering: Das Skript wird in Segmente (Sätze) geteilt, Audio und
+        Video jedes Segments werden nach Inhalts-Hash gecacht. Nach einer Änderung werden
+        nur geänderte Segmente neu gerendert, der Rest wird per Stream-Copy angehängt.
+        """
+        try:
+            segments = split_sentences(text, MAX_SEGMENT_CHARS)
+            if not segments:
+                raise ValueError("No text to render")
+            
+            print(f"🧩 Incremental render: {len(segments)} segments, {resolution}, style: {style}")
+            
+            tts = TextToSpeech()
+            segment_cache = get_segment_cache()
+            
+            def render_segment(segment):
+                audio_file = tts.generate_speech(segment, language=language, voice=voice,
+                                                 speech_speed=speech_speed)
+                if not audio_file:
+                    raise RuntimeError(f"Failed to generate audio for segment: {segment[:50]}")
+                
+                # Audio-Dateiname ist selbst inhaltsadressiert (Hash der Syntheseparameter)
+                key = AudioCache.make_key(text=segment, audio=os.path.basename(audio_file),
+                                          resolution=resolution, style=style, is_preview=is_preview,
+                                          encoder_profile=get_encoder_profile(encoder_profile, is_preview).name)
+                
+                def render(tmp_path):
+                    if not get_render_pool().run(render_slide_video, audio_file, segment, resolution, style,
+                                                 is_preview, tmp_path, encoder_profile,
+                                                 slide_file=get_slide_image(segment, resolution, style)):
+                        raise RuntimeError(f"Failed to render segment: {segment[:50]}")
+                
+                return key, segment_cache.get_or_create(key, render, ext='mp4')
+            
+            workers = min(len(segments), os.cpu_count() or 2)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='segment') as pool:
+                # Kontext (Progress-Reporter, Stage-Timings) in die Segment-Threads übernehmen
+                futures = [pool.submit(propagate(render_segment), segment) for segment in segments]
+                rendered = [future.result() for future in futures]
+            
+            # Finales Video ist durch die Segment-Schlüssel eindeutig bestimmt
+            output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+            video_key = AudioCache.make_key(segments=[key for key, _ in rendered])
+            prefix = "preview_" if is_preview else "video_"
+            output_file = os.path.join(output_dir, f"{prefix}{video_key[:32]}.mp4")
+            
+            if not os.path.exists(output_file):
+                with atomic_output(output_file) as tmp_file:
+                    if not concat_files([path for _, path in rendered], tmp_file, extra_args=['-movflags', '+faststart']):
+                        raise RuntimeError("Failed to concatenate segments")
+                get_storage_manager().register(output_file)
+            
+            print(f"✅ Incremental video created: {output_file}")
+            return output_file
+            
+        except Exception as e:
+            print(f"❌ Error creating incremental video: {str(e)}")
+            return None
+
+    def _encode_static_slide(self, slide_file, audio_file, output_file, duration, fps, profile):
+        """Loopt das gecachte Slide-PNG per FFmpeg über die Audiolänge"""
+        try:
+            return encode_still_image(slide_file, audio_file, output_file, duration, fps=fps, profile=profile)
+        except Exception as e:
+            print(f"❌ Static slide error: {e}")
+            return False
@@ -2,6 +2,11 @@ import React, { useState } from 'react';
 import TextInput from './components/TextInput';
 import VideoDisplay from './components/VideoDisplay';
 
+// Job-Polling: Intervall, Gesamtdauer und tolerierte Fehlversuche in Folge
+const JOB_POLL_INTERVAL_MS = 2000;
+const JOB_POLL_TIMEOUT_MS = 15 * 60 * 1000;
+const JOB_POLL_MAX_FAILURES = 5;
+
 const App: React.FC = () => {
     interface VideoData {
         url: string;
@@ -37,7 +42,53 @@ const App: React.FC = () => {
             throw new Error(errorData.error || 'Ein Fehler ist aufgetreten');
         }
         
-        const data = await response.json();
+        let data = await response.json();
+        
+        // Generierung läuft als Job - Status abfragen bis fertig
+        if (response.status === 202 && data.job_id) {
+            const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+            let failedPolls = 0;
+            while (true) {
+                if (Date.now() > deadline) {
+                    throw new Error('Zeitüberschreitung beim Warten auf das Video');
+                }
+                await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+                
+                // Netzwerkfehler, HTTP-Fehler und ungültige Antworten einige Male tolerieren
+                let job: { status?: string; error?: string; result?: VideoData } | null = null;
+                let jobResponse: Response | null = null;
+                try {
+                    jobResponse = await fetch(`http://localhost:5000${data.status_url}`);
+                    if (jobResponse.ok) {
+                        job = await jobResponse.json();
+                    }
+                } catch (pollError) {
+                    console.warn('Job status poll failed:', pollError);
+                }
+                
+                if (jobResponse && jobResponse.status === 404) {
+                    // Job wurde aufgeräumt oder der Server neu gestartet
+                    throw new Error('Job nicht mehr gefunden - bitte erneut versuchen');
+                }
+                if (!job) {
+                    failedPolls += 1;
+                    if (failedPolls >= JOB_POLL_MAX_FAILURES) {
+                        throw new Error('Status des Jobs konnte nicht abgefragt werden');
+                    }
+                    continue;
+                }
+                failedPolls = 0;
+                
+                if (job.status === 'failed') {
+                    throw new Error(job.error || 'Ein Fehler ist aufgetreten');
+                }
+                if (job.status === 'finished') {
+                    data = job.result;
+                    break;
+                }
+            }
+        }
+        
         setVideoData(data);
         
         // Zeige Erfolg-Info